@@ -1,11 +1,136 @@
 """MNIST data loading utilities."""
 
+import gzip
+import os
+import numpy as np
 import torch
-from torchvision import datasets, transforms
+from pathlib import Path
 from torch.utils.data import DataLoader
 
 
-def get_mnist_loaders(batch_size=64, data_dir='./data/mnist'):
+MNIST_FILES = {
+    True: ("train-images-idx3-ubyte", "train-labels-idx1-ubyte"),
+    False: ("t10k-images-idx3-ubyte", "t10k-labels-idx1-ubyte"),
+}
+
+
+def read_idx(path):
+    """Decode an idx file (optionally gzipped) of unsigned bytes into an array."""
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        data = f.read()
+
+    magic = int.from_bytes(data[:4], "big")
+    if magic >> 8 != 0x08:
+        raise ValueError(f"{path.name}: expected unsigned byte idx data, got magic {magic:#x}")
+
+    ndim = magic & 0xFF
+    shape = tuple(int.from_bytes(data[4 + 4 * i:8 + 4 * i], "big") for i in range(ndim))
+    return np.frombuffer(data, dtype=np.uint8, offset=4 + 4 * ndim).reshape(shape)
+
+
+def _find_raw(raw_dir, name):
+    for candidate in (raw_dir / f"{name}.gz", raw_dir / name):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def load_mnist_arrays(data_dir='./data/mnist', train=True):
+    """Return (images [N, 784], labels [N]) as uint8 arrays.
+
+    The idx files are decoded once and cached as .npy next to them; later
+    calls memory-map the cache copy-on-write instead of decoding again.
+    """
+    root = Path(data_dir) / "MNIST"
+    raw_dir = root / "raw"
+    cache_dir = root / "tensors"
+    split = "train" if train else "test"
+    images_cache = cache_dir / f"{split}-images.npy"
+    labels_cache = cache_dir / f"{split}-labels.npy"
+
+    if not (images_cache.exists() and labels_cache.exists()):
+        image_name, label_name = MNIST_FILES[train]
+        if _find_raw(raw_dir, image_name) is None or _find_raw(raw_dir, label_name) is None:
+            from torchvision import datasets
+            datasets.MNIST(root=data_dir, train=train, download=True)
+
+        images = read_idx(_find_raw(raw_dir, image_name)).reshape(-1, 28 * 28)
+        labels = read_idx(_find_raw(raw_dir, label_name))
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for array, path in ((images, images_cache), (labels, labels_cache)):
+            tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.npy")
+            np.save(tmp_path, array)
+            os.replace(tmp_path, path)
+
+    return np.load(images_cache, mmap_mode="c"), np.load(labels_cache, mmap_mode="c")
+
+
+class TensorMNIST:
+    """One MNIST split as a uint8 tensor; a DataLoader drop-in, sharded when `world_size` > 1."""
+
+    def __init__(self, data_dir='./data/mnist', train=True, batch_size=64, shuffle=True, device='cpu',
+                 rank=0, world_size=1, seed=0):
+        images, labels = load_mnist_arrays(data_dir, train=train)
+        self.images = torch.from_numpy(images).to(device)
+        self.labels = torch.from_numpy(labels).long().to(device)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.device = device
+        self.rank = rank
+        self.world_size = world_size
+        self.seed = seed
+        self.epoch = 0
+
+    @property
+    def num_samples(self):
+        """Samples yielded per pass (this rank's shard when sharded)."""
+        return -(-self.images.size(0) // self.world_size)
+
+    def __len__(self):
+        return (self.num_samples + self.batch_size - 1) // self.batch_size
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def batch(self, indices):
+        return self.images[indices].float().div_(255.0), self.labels[indices]
+
+    def _shard_order(self):
+        total = self.images.size(0)
+        if self.shuffle:
+            generator = torch.Generator().manual_seed(self.seed + self.epoch)
+            order = torch.randperm(total, generator=generator)
+        else:
+            order = torch.arange(total)
+        padded = self.num_samples * self.world_size
+        order = torch.cat([order, order[:padded - total]])
+        return order[self.rank::self.world_size].to(self.images.device)
+
+    def __iter__(self):
+        if self.world_size > 1:
+            order = self._shard_order()
+        elif self.shuffle:
+            order = torch.randperm(self.num_samples, device=self.images.device)
+        else:
+            order = torch.arange(self.num_samples, device=self.images.device)
+
+        for start in range(0, self.num_samples, self.batch_size):
+            yield self.batch(order[start:start + self.batch_size])
+
+
+def get_mnist_loaders(batch_size=64, data_dir='./data/mnist', device='cpu', in_memory=True, rank=0, world_size=1):
+    """Train and test loaders; with `world_size` > 1 each yields only this `rank`'s shard."""
+    if in_memory:
+        shard = {"rank": rank, "world_size": world_size}
+        train_loader = TensorMNIST(data_dir, train=True, batch_size=batch_size, shuffle=True, device=device, **shard)
+        test_loader = TensorMNIST(data_dir, train=False, batch_size=batch_size, shuffle=False, device=device, **shard)
+        return train_loader, test_loader
+
+    from torchvision import datasets, transforms
+
     transform = transforms.Compose([
         transforms.ToTensor(),
     ])
@@ -24,10 +149,18 @@ def get_mnist_loaders(batch_size=64, data_dir='./data/mnist'):
         transform=transform
     )
 
+    train_sampler = test_sampler = None
+    if world_size > 1:
+        from torch.utils.data.distributed import DistributedSampler
+
+        train_sampler = DistributedSampler(train_dataset, num_replicas=world_size, rank=rank, shuffle=True)
+        test_sampler = DistributedSampler(test_dataset, num_replicas=world_size, rank=rank, shuffle=False)
+
     train_loader = DataLoader(
         train_dataset,
         batch_size=batch_size,
-        shuffle=True,
+        shuffle=train_sampler is None,
+        sampler=train_sampler,
         num_workers=2,
         pin_memory=True
     )
@@ -36,6 +169,7 @@ def get_mnist_loaders(batch_size=64, data_dir='./data/mnist'):
         test_dataset,
         batch_size=batch_size,
         shuffle=False,
+        sampler=test_sampler,
         num_workers=2,
         pin_memory=True
     )
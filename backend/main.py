@@ -1,17 +1,68 @@
 """FastAPI server for activation streaming."""
 
+import asyncio
 import os
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from typing import Optional
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response
 import uvicorn
 
+# With eager warm-up off, the first /ws or /activations request builds the engine.
+eager_warmup = os.getenv("RHIZOME_EAGER_WARMUP", "1") != "0"
+
+warmup_state = {
+    "error": None,
+    "seconds": None,
+}
+
+
+async def warm_up():
+    from streaming.engine import warm_up_engine
+
+    start = time.time()
+    try:
+        await asyncio.to_thread(warm_up_engine)
+        warmup_state["seconds"] = round(time.time() - start, 3)
+    except Exception as e:
+        warmup_state["error"] = str(e)
+        print(f"Engine warm-up failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the engine in a worker thread so the event loop (and /health)
+    # stays responsive while the checkpoint, data and topology load.
+    from streaming.metrics import monitor_event_loop
+
+    warmup_task = None
+    if eager_warmup:
+        warmup_task = asyncio.create_task(warm_up())
+    monitor_task = asyncio.create_task(monitor_event_loop())
+
+    yield
+
+    monitor_task.cancel()
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+
+    from streaming.engine import engine_cache
+
+    engine_cache().clear()
+
+
 app = FastAPI(
     title="Rhizome Network Visualization API",
     description="Real-time neural network activation streaming",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Serve frontend static files in production
@@ -26,6 +77,7 @@ def parse_origins(value: str) -> list[str]:
 
 
 allowed_origins = parse_origins(os.getenv("RHIZOME_ALLOWED_ORIGINS", "*"))
+stream_mode = os.getenv("RHIZOME_STREAM_MODE", "broadcast")
 
 app.add_middleware(
     CORSMiddleware,
@@ -51,16 +103,37 @@ async def root():
 @app.get("/health")
 async def health_check():
     import torch
+    from streaming.engine import loaded_engines
 
-    return {
-        "status": "healthy",
-        "cuda_available": torch.cuda.is_available(),
-        "device": torch.cuda.get_device_name(0) if torch.cuda.is_available() else "CPU"
-    }
+    # Any warm engine can serve; the default one may have been evicted.
+    ready = any(engine.ready for engine in loaded_engines())
 
+    if ready:
+        status = "healthy"
+    elif warmup_state["error"] is not None:
+        status = "error"
+    elif not eager_warmup:
+        # Nothing warms until traffic arrives, so holding traffic back would deadlock.
+        status = "lazy"
+    else:
+        status = "starting"
 
-@app.get("/model/info")
-async def model_info():
+    # 503 until warm so load balancers hold traffic back.
+    return JSONResponse(
+        status_code=200 if status in ("healthy", "lazy") else 503,
+        content={
+            "status": status,
+            "ready": ready,
+            "warmup_seconds": warmup_state["seconds"],
+            "error": warmup_state["error"],
+            "cuda_available": torch.cuda.is_available(),
+            "device": torch.cuda.get_device_name(0) if torch.cuda.is_available() else "CPU"
+        }
+    )
+
+
+@lru_cache(maxsize=1)
+def architecture_info() -> dict:
     from network.model import RhizomeAutoencoder
 
     model = RhizomeAutoencoder()
@@ -75,6 +148,95 @@ async def model_info():
     }
 
 
+@app.get("/model/info")
+async def model_info(checkpoint: Optional[str] = None):
+    from streaming.engine import peek_engine
+
+    # Architecture facts are the same for every checkpoint; build them once.
+    info = dict(architecture_info())
+    engine = peek_engine(checkpoint)
+    info["loaded"] = engine is not None
+    if engine is not None:
+        info["checkpoint"] = engine.checkpoint_name
+        info["quantized"] = engine.quantized
+        info["total_nodes"] = engine.topology_metadata["total_nodes"]
+        info["total_connections"] = engine.topology_metadata["total_connections"]
+    return info
+
+
+@app.get("/models")
+async def models():
+    from streaming.engine import engine_cache, list_checkpoints
+
+    cache = engine_cache()
+    return {
+        "available": list_checkpoints(),
+        "loaded": [
+            {
+                "checkpoint": engine.checkpoint_name,
+                "clients": engine.client_count(),
+                "memory_mb": round(engine.memory_bytes() / 2**20, 2)
+            }
+            for engine in cache.engines()
+        ],
+        "budget_mb": round(cache.budget_bytes / 2**20, 2)
+    }
+
+
+@app.get("/activations")
+async def activations(request: Request):
+    """Activation batches by `label`, `start`/`end` index range or random `sample`.
+
+    `format` is f16/u8 (the RZAB per-layer binary layout) or json;
+    `split` is train or test; `checkpoint` picks the model.
+    """
+    from streaming.engine import warm_up_engine
+    from streaming.frames import resolve_format
+    from streaming.query import parse_query
+
+    params = request.query_params
+    split = params.get("split", "train")
+    if split not in ("train", "test"):
+        return JSONResponse(status_code=400, content={"error": "split must be train or test"})
+
+    try:
+        engine = await asyncio.to_thread(warm_up_engine, params.get("checkpoint"))
+        query = await asyncio.to_thread(engine.get_query, split)
+        selection = parse_query(params, query.max_batch)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+    fmt = resolve_format(params.get("format", "f16"))
+    message, cached = await asyncio.to_thread(query.run, selection, fmt)
+    media_type = "application/json" if fmt == "json" else "application/octet-stream"
+    return Response(
+        content=message,
+        media_type=media_type,
+        headers={"X-Rhizome-Cache": "hit" if cached else "miss"}
+    )
+
+
+@app.get("/recordings")
+async def recordings():
+    from streaming.recording import list_recordings
+
+    return {"available": list_recordings()}
+
+
+@app.get("/clients")
+async def clients():
+    from streaming.engine import loaded_engines
+
+    return {"clients": [client for engine in loaded_engines() for client in engine.client_stats()]}
+
+
+@app.get("/metrics")
+async def metrics():
+    from streaming.engine import render_metrics
+
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
@@ -83,17 +245,71 @@ async def websocket_endpoint(websocket: WebSocket):
     print(f"WebSocket connected: {client_info}")
 
     try:
-        from streaming.engine import get_engine
+        from streaming.compression import encode_codec_announcement, requested_codec
+        from streaming.engine import warm_up_engine
+        from streaming.frames import build_encoder, resolve_format
+        from streaming.lod import parse_lod
+        from streaming.recording import ReplayCursor, open_recording, replay_recording
+
+        params = websocket.query_params
+        replay = params.get("replay")
+        try:
+            lod = parse_lod(params)
+            # A replay is served straight from the recording; no model is loaded.
+            if replay:
+                source = await asyncio.to_thread(open_recording, replay)
+            else:
+                source = await asyncio.to_thread(warm_up_engine, params.get("checkpoint"))
+        except ValueError as e:
+            print(f"Rejected {client_info}: {e}")
+            await websocket.close(code=1008, reason=str(e))
+            return
+
+        codec = None
+        codec_name = requested_codec(params)
+        if codec_name is not None:
+            codec = await asyncio.to_thread(
+                source.get_codec,
+                codec_name,
+                resolve_format(params.get("format", "json")),
+                params.get("dict", "1") != "0"
+            )
+            # Tells the client which codec (if any) it actually got.
+            await websocket.send_bytes(encode_codec_announcement(codec))
+
+        # A pooled level of detail is shared by every client asking for it.
+        level = await asyncio.to_thread(source.lod.get, *lod) if lod else None
+        encoder = build_encoder(params, codec, level)
 
-        engine = get_engine()
+        if level is not None:
+            topology_messages = await asyncio.to_thread(level.messages, codec)
+        else:
+            # Progressive clients get the coarse level now and the rest
+            # interleaved with the first frames.
+            progressive = params.get("topology", "").lower() == "progressive"
+            topology_messages = await asyncio.to_thread(source.get_topology_messages, codec, progressive)
 
         print("Sending topology...")
-        topology_message = engine.get_topology_message()
+        topology_message, preamble = topology_messages[0], topology_messages[1:]
         await websocket.send_bytes(topology_message)
-        print(f"✓ Topology sent ({len(topology_message) / 1024:.2f} KB)")
+        print(f"✓ Topology sent ({len(topology_message) / 1024:.2f} KB"
+              f"{f', {len(preamble)} chunks to follow' if preamble else ''})")
 
-        print("Starting activation stream...")
-        await engine.stream_activations(websocket)
+        print(f"Starting activation stream ({type(encoder).__name__})...")
+        if replay:
+            await replay_recording(
+                websocket,
+                source,
+                encoder,
+                ReplayCursor.from_params(params),
+                loop=params.get("loop", "1") != "0",
+                client=client_info,
+                preamble=preamble
+            )
+        elif stream_mode == "per-client":
+            await source.stream_activations(websocket, encoder, client=client_info, preamble=preamble)
+        else:
+            await source.broadcast_activations(websocket, encoder, client=client_info, preamble=preamble)
 
     except WebSocketDisconnect:
         print(f"WebSocket disconnected: {client_info}")
@@ -0,0 +1,70 @@
+"""Full test-set evaluation of reconstruction quality."""
+
+import time
+from typing import Any, Dict
+
+import numpy as np
+import torch
+
+
+def _synchronize(device):
+    if torch.device(device).type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def evaluate_reconstruction(model, data_loader, device, num_classes: int = 10) -> Dict[str, Any]:
+    """Reconstruction MSE over every sample of `data_loader`, overall and per label.
+
+    Runs under `inference_mode`. Per-sample squared errors are summed into
+    per-label accumulators on `device`, so the only host transfer is the
+    final read. One untimed batch warms the model up; each timed batch
+    is synchronized so `latency_ms` covers the forward pass and the loss.
+    """
+    model.eval()
+    sums = torch.zeros(num_classes, dtype=torch.float64, device=device)
+    counts = torch.zeros(num_classes, dtype=torch.int64, device=device)
+    latencies = []
+
+    with torch.inference_mode():
+        images, _ = next(iter(data_loader))
+        model(images.view(images.size(0), -1).to(device))
+        _synchronize(device)
+
+        start = time.perf_counter()
+        for images, labels in data_loader:
+            batch_start = time.perf_counter()
+            images = images.view(images.size(0), -1).to(device, non_blocking=True)
+            labels = labels.to(device, non_blocking=True)
+
+            errors = (model(images).float() - images).pow_(2).mean(dim=1)
+            sums.index_add_(0, labels, errors.double())
+            counts.index_add_(0, labels, torch.ones_like(labels))
+
+            _synchronize(device)
+            latencies.append(time.perf_counter() - batch_start)
+        seconds = time.perf_counter() - start
+
+    sums, counts = sums.cpu().numpy(), counts.cpu().numpy()
+    samples = int(counts.sum())
+    latencies_ms = np.array(latencies) * 1000
+
+    return {
+        "samples": samples,
+        "batches": len(latencies),
+        "mse": float(sums.sum() / samples),
+        "per_label": {
+            str(label): {
+                "samples": int(counts[label]),
+                "mse": float(sums[label] / counts[label])
+            }
+            for label in range(num_classes) if counts[label]
+        },
+        "seconds": seconds,
+        "samples_per_sec": samples / seconds,
+        "latency_ms": {
+            "mean": float(latencies_ms.mean()),
+            "p50": float(np.percentile(latencies_ms, 50)),
+            "p95": float(np.percentile(latencies_ms, 95)),
+            "max": float(latencies_ms.max())
+        }
+    }
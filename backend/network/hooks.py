@@ -2,29 +2,95 @@
 
 import torch
 import torch.nn as nn
-from typing import Dict
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+from network.quantization import LINEAR_TYPES
 
 
 class ActivationCapture:
-    def __init__(self, model: nn.Module):
+    """Records every Linear's output, per layer or (`flat=True`) into one preallocated buffer."""
+
+    def __init__(
+        self,
+        model: nn.Module,
+        flat: bool = False,
+        layers: Optional[Sequence[str]] = None,
+        max_batch: int = 1,
+        pin_memory: bool = False
+    ):
         self.model = model
         self.activations: Dict[str, torch.Tensor] = {}
         self.hooks = []
+        self.flat = flat
+        self.pin_memory = pin_memory
+
+        self.layer_modules = [
+            (name, module)
+            for name, module in model.named_modules()
+            if isinstance(module, LINEAR_TYPES) and (layers is None or name in layers)
+        ]
+        self.layer_order: List[str] = [name for name, _ in self.layer_modules]
+        self.layer_sizes: List[int] = [module.out_features for _, module in self.layer_modules]
+
+        self.batch_size = 0
+        self.buffer: Optional[torch.Tensor] = None
+        self.host_buffer: Optional[torch.Tensor] = None
+        if flat:
+            self._allocate(max_batch)
+
         self._register_hooks()
 
+    def _allocate(self, max_batch: int, device: Optional[torch.device] = None):
+        if device is None:
+            param = next(self.model.parameters(), None)
+            device = param.device if param is not None else torch.device("cpu")
+        total = sum(self.layer_sizes)
+
+        self.buffer = torch.zeros(max_batch, total, device=device)
+        self.segments = torch.repeat_interleave(
+            torch.arange(len(self.layer_sizes), device=device),
+            torch.tensor(self.layer_sizes, device=device)
+        )
+
+        if device.type == "cpu":
+            self.host_buffer = self.buffer
+        else:
+            self.host_buffer = torch.empty(
+                max_batch,
+                total,
+                pin_memory=self.pin_memory and torch.cuda.is_available()
+            )
+
     def _register_hooks(self):
         def get_activation(name):
             def hook(module, input, output):
                 self.activations[name] = output.detach()
             return hook
 
-        for name, module in self.model.named_modules():
-            if isinstance(module, nn.Linear):
+        def write_flat(start, end):
+            def hook(module, input, output):
+                batch = output.shape[0]
+                if batch > self.buffer.shape[0] or output.device != self.buffer.device:
+                    # Bigger batch than planned or the model moved: grow once, then reuse.
+                    self._allocate(max(batch, self.buffer.shape[0]), output.device)
+                self.batch_size = batch
+                self.buffer[:batch, start:end].copy_(output.detach())
+            return hook
+
+        start = 0
+        for name, module in self.layer_modules:
+            if self.flat:
+                end = start + module.out_features
+                hook = module.register_forward_hook(write_flat(start, end))
+                start = end
+            else:
                 hook = module.register_forward_hook(get_activation(name))
-                self.hooks.append(hook)
+            self.hooks.append(hook)
 
     def clear_activations(self):
         self.activations.clear()
+        self.batch_size = 0
 
     def get_activations(self, normalize=True) -> Dict[str, torch.Tensor]:
         if normalize:
@@ -32,18 +98,48 @@ class ActivationCapture:
         return self.activations.copy()
 
     def _normalize_activations(self, activations: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        # Scale each sample to its own per-layer max; all-zero rows stay zero.
         normalized = {}
         for name, activation in activations.items():
             act = torch.relu(activation)
-
-            max_val = act.max()
-            if max_val > 0:
-                normalized[name] = act / max_val
-            else:
-                normalized[name] = act
+            max_val = act.amax(dim=-1, keepdim=True)
+            normalized[name] = act / max_val.clamp_min(torch.finfo(act.dtype).tiny)
 
         return normalized
 
+    def get_flat(self, normalize=True) -> torch.Tensor:
+        """Flat [batch, total_nodes] view of the last forward pass, on the model's device.
+
+        Normalization is done in place, so the view stays valid until the
+        next forward pass.
+        """
+        flat = self.buffer[:self.batch_size]
+        if normalize:
+            flat.relu_()
+            maxes = torch.zeros(flat.shape[0], len(self.layer_sizes), device=flat.device)
+            maxes.scatter_reduce_(
+                1,
+                self.segments.expand(flat.shape[0], -1),
+                flat,
+                reduce="amax",
+                include_self=True
+            )
+            maxes.clamp_min_(torch.finfo(flat.dtype).tiny)
+            flat.div_(maxes.index_select(1, self.segments))
+        return flat
+
+    def get_flat_host(self, normalize=True) -> np.ndarray:
+        """Like `get_flat`, copied to host memory with a single transfer."""
+        flat = self.get_flat(normalize=normalize)
+        if self.host_buffer is self.buffer:
+            return flat.numpy()
+
+        host = self.host_buffer[:flat.shape[0]]
+        host.copy_(flat, non_blocking=self.host_buffer.is_pinned())
+        if self.host_buffer.is_pinned():
+            torch.cuda.current_stream(flat.device).synchronize()
+        return host.numpy()
+
     def remove_hooks(self):
         for hook in self.hooks:
             hook.remove()
@@ -0,0 +1,54 @@
+"""Dynamic int8 quantization for CPU inference."""
+
+import warnings
+from itertools import chain
+
+import torch.nn as nn
+
+try:
+    from torch.ao.nn.quantized.dynamic import Linear as DynamicQuantizedLinear
+except ImportError:  # torch builds without quantized kernels
+    DynamicQuantizedLinear = None
+
+# Layers that count as nodes in the topology, quantized or not.
+LINEAR_TYPES = (nn.Linear,) if DynamicQuantizedLinear is None else (nn.Linear, DynamicQuantizedLinear)
+
+
+def quantize_dynamic_int8(model: nn.Module) -> nn.Module:
+    """Copy of `model` with every `nn.Linear` swapped for a dynamic int8 Linear.
+
+    Weights are quantized once, per output channel; activations are
+    quantized per batch at run time, so no calibration data is needed.
+    Module names and output sizes are unchanged, so `ActivationCapture`
+    and the topology see the same layers. CPU only.
+    """
+    if DynamicQuantizedLinear is None:
+        raise RuntimeError("This torch build has no dynamic quantization support")
+
+    from torch.ao.quantization import per_channel_dynamic_qconfig, quantize_dynamic
+
+    with warnings.catch_warnings():
+        # torch.ao.quantization is deprecated in favour of torchao, which
+        # isn't a dependency here; the eager-mode API still works.
+        warnings.simplefilter("ignore", DeprecationWarning)
+        warnings.simplefilter("ignore", UserWarning)
+        return quantize_dynamic(model.cpu().eval(), {nn.Linear: per_channel_dynamic_qconfig})
+
+
+def is_quantized(model: nn.Module) -> bool:
+    return DynamicQuantizedLinear is not None and any(
+        isinstance(module, DynamicQuantizedLinear) for module in model.modules()
+    )
+
+
+def model_bytes(model: nn.Module) -> int:
+    """Bytes held by parameters, buffers and packed int8 weights."""
+    total = sum(t.numel() * t.element_size() for t in chain(model.parameters(), model.buffers()))
+    if DynamicQuantizedLinear is not None:
+        for module in model.modules():
+            if isinstance(module, DynamicQuantizedLinear):
+                weight, bias = module.weight(), module.bias()
+                total += weight.numel() * weight.element_size()
+                if bias is not None:
+                    total += bias.numel() * bias.element_size()
+    return total
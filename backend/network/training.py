@@ -1,12 +1,74 @@
 """Training utilities for the autoencoder."""
 
+import os
+import shutil
+import socket
 import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
 import torch.nn as nn
 import torch.optim as optim
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from torch.nn.parallel import DistributedDataParallel
 import time
 
 
+def resolve_amp_dtype(amp, device):
+    """Map an --amp choice to an autocast dtype for `device` (None disables it)."""
+    if amp in (None, 'none'):
+        return None
+
+    device_type = torch.device(device).type
+    if amp == 'auto':
+        amp = 'fp16' if device_type == 'cuda' else 'bf16'
+
+    if amp == 'fp16' and device_type != 'cuda':
+        print("fp16 autocast needs CUDA, using bf16 instead")
+        amp = 'bf16'
+
+    return torch.float16 if amp == 'fp16' else torch.bfloat16
+
+
+def scale_hyperparameters(batch_size, learning_rate, scale=1, rule='linear'):
+    """Scale batch size by `scale` and the learning rate to match.
+
+    'linear' multiplies the learning rate by `scale`, 'sqrt' by its square root.
+    """
+    factor = scale if rule == 'linear' else scale ** 0.5
+    return int(batch_size * scale), learning_rate * factor
+
+
+def _num_samples(loader):
+    """Samples one pass over `loader` yields in this process."""
+    if hasattr(loader, 'num_samples'):
+        return loader.num_samples
+    return len(loader.sampler)
+
+
+def _set_epoch(loader, epoch):
+    # Sharded loaders reshuffle per epoch with a seed every rank agrees on.
+    sampler = loader if hasattr(loader, 'set_epoch') else getattr(loader, 'sampler', None)
+    if hasattr(sampler, 'set_epoch'):
+        sampler.set_epoch(epoch)
+
+
+def is_distributed():
+    return dist.is_available() and dist.is_initialized()
+
+
+def is_main_process():
+    return not is_distributed() or dist.get_rank() == 0
+
+
+def _mean_across_ranks(value):
+    if not is_distributed():
+        return value
+    total = torch.tensor([value], dtype=torch.float64)
+    dist.all_reduce(total)
+    return total.item() / dist.get_world_size()
+
+
 def train_autoencoder(
     model,
     train_loader,
@@ -15,100 +77,296 @@ def train_autoencoder(
     learning_rate=0.001,
     device='cuda',
     checkpoint_dir='./checkpoints',
-    save_every=5
+    save_every=5,
+    fast=False,
+    amp=None,
+    compile_model=False
 ):
+    """Train `model` and checkpoint it every `save_every` epochs.
+
+    `fast` keeps the running loss on the device instead of syncing with
+    .item() every step. `amp` ('bf16', 'fp16' or 'auto') enables autocast
+    and `compile_model` runs the forward pass through torch.compile; the
+    uncompiled module is what gets checkpointed.
+
+    Inside a process group (see `train_distributed`) the model is wrapped in
+    DistributedDataParallel, the loaders are expected to be sharded, losses
+    and throughput are reported across all ranks, and only rank 0 prints
+    and writes checkpoints.
+    """
     model = model.to(device)
     criterion = nn.MSELoss()
     optimizer = optim.Adam(model.parameters(), lr=learning_rate)
+    amp_dtype = resolve_amp_dtype(amp, device)
+    scaler = torch.amp.GradScaler('cuda', enabled=amp_dtype == torch.float16)
+
+    distributed = is_distributed()
+    main_process = is_main_process()
+    world_size = dist.get_world_size() if distributed else 1
+
+    train_model = DistributedDataParallel(model) if distributed else model
+    train_model = torch.compile(train_model) if compile_model else train_model
 
     checkpoint_path = Path(checkpoint_dir)
-    checkpoint_path.mkdir(parents=True, exist_ok=True)
+    if main_process:
+        checkpoint_path.mkdir(parents=True, exist_ok=True)
 
     history = {
         'train_loss': [],
         'test_loss': [],
-        'epochs': []
+        'epochs': [],
+        'samples_per_sec': []
     }
 
-    for epoch in range(1, epochs + 1):
-        epoch_start = time.time()
+    train_samples = _num_samples(train_loader) * world_size
+    writer = CheckpointWriter() if main_process else None
+
+    try:
+        for epoch in range(1, epochs + 1):
+            _set_epoch(train_loader, epoch)
+            epoch_start = time.time()
+
+            train_loss = train_epoch(
+                train_model, train_loader, criterion, optimizer, device,
+                amp_dtype=amp_dtype, device_loss=fast, scaler=scaler
+            )
+            train_time = time.time() - epoch_start
+            test_loss = validate_epoch(
+                train_model, test_loader, criterion, device,
+                amp_dtype=amp_dtype, device_loss=fast
+            )
+            train_loss = _mean_across_ranks(train_loss)
+            test_loss = _mean_across_ranks(test_loss)
+
+            samples_per_sec = train_samples / train_time
+
+            history['train_loss'].append(train_loss)
+            history['test_loss'].append(test_loss)
+            history['epochs'].append(epoch)
+            history['samples_per_sec'].append(samples_per_sec)
+
+            if not main_process:
+                continue
+
+            epoch_time = time.time() - epoch_start
+            print(f"Epoch {epoch:2d}/{epochs} "
+                  f"train={train_loss:.6f} "
+                  f"test={test_loss:.6f} "
+                  f"time={epoch_time:.2f}s "
+                  f"samples/s={samples_per_sec:.0f}")
+
+            if epoch % save_every == 0 or epoch == epochs:
+                save_checkpoint(model, optimizer, epoch, train_loss, checkpoint_path, writer=writer)
+    finally:
+        if writer is not None:
+            writer.close()
 
-        train_loss = train_epoch(model, train_loader, criterion, optimizer, device)
-        test_loss = validate_epoch(model, test_loader, criterion, device)
+    return history
 
-        history['train_loss'].append(train_loss)
-        history['test_loss'].append(test_loss)
-        history['epochs'].append(epoch)
 
-        epoch_time = time.time() - epoch_start
-        print(f"Epoch {epoch:2d}/{epochs} "
-              f"train={train_loss:.6f} "
-              f"test={test_loss:.6f} "
-              f"time={epoch_time:.2f}s")
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
 
-        if epoch % save_every == 0 or epoch == epochs:
-            save_checkpoint(model, optimizer, epoch, train_loss, checkpoint_path)
 
-    return history
+def _distributed_worker(rank, world_size, port, fn, args, results):
+    os.environ["MASTER_ADDR"] = "127.0.0.1"
+    os.environ["MASTER_PORT"] = str(port)
+    # Split the cores between ranks instead of every rank using all of them.
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // world_size))
+
+    dist.init_process_group("gloo", rank=rank, world_size=world_size)
+    try:
+        result = fn(*args)
+        if rank == 0:
+            results.put(result)
+    finally:
+        dist.destroy_process_group()
+
+
+def run_distributed(fn, world_size, *args):
+    """Run `fn(*args)` in `world_size` local processes joined by a gloo group.
+
+    `fn` must be importable (module level) for the spawned processes.
+    Returns rank 0's result.
+    """
+    results = mp.get_context("spawn").SimpleQueue()
+    mp.spawn(
+        _distributed_worker,
+        args=(world_size, _free_port(), fn, args, results),
+        nprocs=world_size,
+        join=True
+    )
+    return results.get()
+
+
+def _train_worker(batch_size, data_dir, train_kwargs):
+    from data.loader import get_mnist_loaders
+    from network.model import RhizomeAutoencoder
 
+    # DDP broadcasts rank 0's initial weights, so ranks start identical.
+    model = RhizomeAutoencoder()
+    train_loader, test_loader = get_mnist_loaders(
+        batch_size=batch_size,
+        data_dir=data_dir,
+        device='cpu',
+        rank=dist.get_rank(),
+        world_size=dist.get_world_size()
+    )
+    return train_autoencoder(model, train_loader, test_loader, device='cpu', **train_kwargs)
 
-def train_epoch(model, train_loader, criterion, optimizer, device):
+
+def train_distributed(world_size, batch_size=64, data_dir='./data/mnist', **train_kwargs):
+    """Data-parallel CPU training over `world_size` processes; returns rank 0's history.
+
+    `batch_size` is per process, so the effective batch is
+    `batch_size * world_size`. Other arguments go to `train_autoencoder`.
+    """
+    return run_distributed(_train_worker, world_size, batch_size, data_dir, train_kwargs)
+
+
+def train_epoch(model, train_loader, criterion, optimizer, device, amp_dtype=None, device_loss=False, scaler=None):
     model.train()
-    total_loss = 0.0
+    total_loss = torch.zeros((), device=device) if device_loss else 0.0
+    device_type = torch.device(device).type
 
     for images, _ in train_loader:
-        images = images.view(images.size(0), -1).to(device)
+        images = images.view(images.size(0), -1).to(device, non_blocking=True)
 
-        reconstructed = model(images)
-        loss = criterion(reconstructed, images)
+        with torch.autocast(device_type, dtype=amp_dtype, enabled=amp_dtype is not None):
+            reconstructed = model(images)
+            loss = criterion(reconstructed.float(), images)
 
         optimizer.zero_grad()
-        loss.backward()
-        optimizer.step()
-
-        total_loss += loss.item()
+        if scaler is not None and scaler.is_enabled():
+            scaler.scale(loss).backward()
+            scaler.step(optimizer)
+            scaler.update()
+        else:
+            loss.backward()
+            optimizer.step()
+
+        if device_loss:
+            total_loss += loss.detach()
+        else:
+            total_loss += loss.item()
 
     avg_loss = total_loss / len(train_loader)
-    return avg_loss
+    return avg_loss.item() if device_loss else avg_loss
 
 
-def validate_epoch(model, test_loader, criterion, device):
+def validate_epoch(model, test_loader, criterion, device, amp_dtype=None, device_loss=False):
     model.eval()
-    total_loss = 0.0
+    total_loss = torch.zeros((), device=device) if device_loss else 0.0
+    device_type = torch.device(device).type
 
-    with torch.no_grad():
+    with torch.no_grad(), torch.autocast(device_type, dtype=amp_dtype, enabled=amp_dtype is not None):
         for images, _ in test_loader:
-            images = images.view(images.size(0), -1).to(device)
+            images = images.view(images.size(0), -1).to(device, non_blocking=True)
 
             reconstructed = model(images)
-            loss = criterion(reconstructed, images)
+            loss = criterion(reconstructed.float(), images)
 
-            total_loss += loss.item()
+            if device_loss:
+                total_loss += loss.detach()
+            else:
+                total_loss += loss.item()
 
     avg_loss = total_loss / len(test_loader)
-    return avg_loss
+    return avg_loss.item() if device_loss else avg_loss
 
 
-def save_checkpoint(model, optimizer, epoch, loss, checkpoint_dir):
-    checkpoint_path = Path(checkpoint_dir)
-    filename = checkpoint_path / f"rhizome_autoencoder_epoch_{epoch}.pth"
+def weights_path_for(checkpoint_path):
+    """Weights-only sibling of a checkpoint: foo.pth -> foo.weights.pth."""
+    path = Path(checkpoint_path)
+    return path.with_name(f"{path.stem}.weights{path.suffix}")
 
-    torch.save({
-        'epoch': epoch,
-        'model_state_dict': model.state_dict(),
-        'optimizer_state_dict': optimizer.state_dict(),
-        'loss': loss,
-    }, filename)
 
+def _snapshot(state):
+    # Detached CPU copy so training can keep mutating the live tensors.
+    if isinstance(state, torch.Tensor):
+        return state.detach().to('cpu', copy=True)
+    if isinstance(state, dict):
+        return {key: _snapshot(value) for key, value in state.items()}
+    if isinstance(state, (list, tuple)):
+        return type(state)(_snapshot(value) for value in state)
+    return state
+
+
+def _save_atomic(obj, path):
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    torch.save(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _link_atomic(source, target):
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, target)
+
+
+def _write_checkpoint(checkpoint, checkpoint_dir):
+    checkpoint_path = Path(checkpoint_dir)
+    filename = checkpoint_path / f"rhizome_autoencoder_epoch_{checkpoint['epoch']}.pth"
     latest_path = checkpoint_path / "rhizome_autoencoder_latest.pth"
-    torch.save({
+
+    _save_atomic(checkpoint, filename)
+    _save_atomic({
+        'epoch': checkpoint['epoch'],
+        'model_state_dict': checkpoint['model_state_dict'],
+        'loss': checkpoint['loss'],
+    }, weights_path_for(filename))
+
+    # "latest" is a hard link to the epoch files, not a second serialization.
+    _link_atomic(filename, latest_path)
+    _link_atomic(weights_path_for(filename), weights_path_for(latest_path))
+
+    print(f"Checkpoint saved: {filename.name}")
+
+
+class CheckpointWriter:
+    """Writes checkpoints on one background thread, in submission order."""
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rhizome-checkpoint")
+        self.pending = []
+
+    def submit(self, checkpoint, checkpoint_dir):
+        self.pending = [future for future in self.pending if not future.done() or future.exception()]
+        self.pending.append(self.executor.submit(_write_checkpoint, checkpoint, checkpoint_dir))
+
+    def close(self):
+        """Wait for outstanding writes and re-raise the first failure."""
+        try:
+            for future in self.pending:
+                future.result()
+        finally:
+            self.pending.clear()
+            self.executor.shutdown(wait=True)
+
+
+def save_checkpoint(model, optimizer, epoch, loss, checkpoint_dir, writer=None):
+    """Write one checkpoint plus a weights-only copy, then link both as latest.
+
+    With a `writer` the state is snapshotted to CPU here and serialized on
+    the writer's thread so the caller can continue training immediately.
+    """
+    checkpoint = {
         'epoch': epoch,
         'model_state_dict': model.state_dict(),
         'optimizer_state_dict': optimizer.state_dict(),
         'loss': loss,
-    }, latest_path)
+    }
 
-    print(f"Checkpoint saved: {filename.name}")
+    if writer is None:
+        _write_checkpoint(checkpoint, checkpoint_dir)
+    else:
+        writer.submit(_snapshot(checkpoint), checkpoint_dir)
 
 
 def load_checkpoint(model, checkpoint_path, device='cuda'):
@@ -119,3 +377,32 @@ def load_checkpoint(model, checkpoint_path, device='cuda'):
     print(f"Loaded checkpoint epoch {checkpoint['epoch']} loss {checkpoint['loss']:.6f}")
 
     return checkpoint
+
+
+def load_weights(model, weights_path, device='cuda'):
+    """Load a weights-only file by memory-mapping it, without optimizer state.
+
+    On CPU the parameters end up backed by the page cache rather than
+    copied; other devices copy once from the mapping.
+    """
+    checkpoint = torch.load(weights_path, map_location='cpu', mmap=True, weights_only=True)
+    model.load_state_dict(checkpoint['model_state_dict'], assign=True)
+    model = model.to(device)
+
+    print(f"Loaded weights epoch {checkpoint['epoch']} loss {checkpoint['loss']:.6f}")
+
+    return checkpoint
+
+
+def load_model_weights(model, checkpoint_path, device='cuda'):
+    """Prefer the weights-only sibling of `checkpoint_path` when it is up to date."""
+    weights_path = weights_path_for(checkpoint_path)
+    checkpoint_path = Path(checkpoint_path)
+
+    if weights_path.exists() and (
+        not checkpoint_path.exists()
+        or weights_path.stat().st_mtime >= checkpoint_path.stat().st_mtime
+    ):
+        return load_weights(model, weights_path, device=device)
+
+    return load_checkpoint(model, checkpoint_path, device=device)
@@ -0,0 +1,146 @@
+"""Fan-out of one shared frame producer to many WebSocket subscribers."""
+
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Set
+
+from streaming.scheduler import FrameScheduler
+
+
+class SubscriberClosed(Exception):
+    pass
+
+
+class Subscriber:
+    """Bounded per-client queue that drops the oldest frame when full."""
+
+    def __init__(self, maxsize: int = 4, name: str = ""):
+        self.name = name
+        self.queue: deque = deque(maxlen=maxsize)
+        self.dropped = 0
+        self.coalesced = 0
+        self.pacer = None
+        self.closed = False
+        self.error: Optional[BaseException] = None
+        self._ready = asyncio.Event()
+
+    def put(self, item: Any):
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(item)
+        self._ready.set()
+
+    async def get(self) -> Any:
+        while not self.queue:
+            if self.closed:
+                raise SubscriberClosed() from self.error
+            self._ready.clear()
+            await self._ready.wait()
+        return self.queue.popleft()
+
+    async def get_latest(self) -> Any:
+        """Wait for a frame, then return only the newest one queued (latest wins)."""
+        item = await self.get()
+        while self.queue:
+            item = self.queue.popleft()
+            self.coalesced += 1
+        return item
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "client": self.name,
+            "queue_depth": len(self.queue),
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+        if self.pacer is not None:
+            stats.update(self.pacer.stats())
+        return stats
+
+    def close(self, error: Optional[BaseException] = None):
+        self.closed = True
+        self.error = error
+        self._ready.set()
+
+
+class Broadcaster:
+    """Runs `produce` once per tick on a worker thread while anyone is subscribed."""
+
+    def __init__(
+        self,
+        produce: Callable[[int, float], Any],
+        target_fps: int = 30,
+        queue_size: int = 4
+    ):
+        self.produce = produce
+        self.target_fps = target_fps
+        self.queue_size = queue_size
+        self.subscribers: Set[Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def subscribe(self, name: str = "") -> Subscriber:
+        subscriber = Subscriber(self.queue_size, name=name)
+        self.subscribers.add(subscriber)
+        if self._thread is None or not self._thread.is_alive() or self._stop.is_set():
+            self._loop = asyncio.get_running_loop()
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self._stop,),
+                name="rhizome-broadcast",
+                daemon=True
+            )
+            self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+        subscriber.close()
+        if not self.subscribers:
+            self.stop()
+
+    def publish(self, item: Any):
+        for subscriber in self.subscribers:
+            subscriber.put(item)
+
+    def stop(self):
+        # The worker notices within one frame interval; never join from the loop.
+        self._stop.set()
+
+    def _fail(self, error: BaseException):
+        for subscriber in list(self.subscribers):
+            subscriber.close(error)
+        self.subscribers.clear()
+
+    def _run(self, stop: threading.Event):
+        print(f"Starting broadcast producer (target: {self.target_fps} FPS)...")
+
+        frame_count = 0
+        scheduler = FrameScheduler(self.target_fps)
+        loop = self._loop
+
+        try:
+            while not stop.is_set():
+                item = self.produce(frame_count, scheduler.elapsed())
+                loop.call_soon_threadsafe(self.publish, item)
+
+                frame_count += 1
+
+                scheduler.sleep()
+
+                if frame_count % 100 == 0:
+                    actual_fps = frame_count / scheduler.elapsed()
+                    print(f"Frame {frame_count} | FPS: {actual_fps:.1f} | "
+                          f"Subscribers: {len(self.subscribers)} | "
+                          f"Missed deadlines: {scheduler.missed}")
+
+        except Exception as e:
+            # A closed loop means the server is shutting down; nobody to tell.
+            if not loop.is_closed():
+                print(f"Broadcast producer error: {e}")
+                loop.call_soon_threadsafe(self._fail, e)
+        finally:
+            print(f"Broadcast producer stopped. Total frames: {frame_count}")
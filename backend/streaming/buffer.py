@@ -0,0 +1,62 @@
+"""Fixed-capacity ring buffer of ready activation frames."""
+
+import threading
+import numpy as np
+from typing import Optional, Tuple
+
+
+class FrameRingBuffer:
+    """Preallocated FIFO of flat activation rows and their labels.
+
+    A refill thread pushes whole batches while the pacing loop pops one row
+    per frame; a lock keeps the head/count bookkeeping consistent between
+    the two.
+    """
+
+    def __init__(self, capacity: int, width: int):
+        self.capacity = capacity
+        self.values = np.empty((capacity, width), dtype=np.float32)
+        self.labels = np.empty(capacity, dtype=np.int64)
+        self.head = 0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def free(self) -> int:
+        return self.capacity - self.count
+
+    def push_batch(self, values: np.ndarray, labels: np.ndarray) -> int:
+        """Append as many rows as fit and return how many were written."""
+        with self.lock:
+            n = min(len(values), self.capacity - self.count)
+            tail = (self.head + self.count) % self.capacity
+
+            first = min(n, self.capacity - tail)
+            self.values[tail:tail + first] = values[:first]
+            self.labels[tail:tail + first] = labels[:first]
+
+            rest = n - first
+            if rest:
+                self.values[:rest] = values[first:n]
+                self.labels[:rest] = labels[first:n]
+
+            self.count += n
+            return n
+
+    def pop(self) -> Optional[Tuple[np.ndarray, int]]:
+        """Remove the oldest row, copied so the slot can be reused."""
+        with self.lock:
+            if self.count == 0:
+                return None
+
+            index = self.head
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+            return self.values[index].copy(), int(self.labels[index])
+
+    def clear(self):
+        with self.lock:
+            self.head = 0
+            self.count = 0
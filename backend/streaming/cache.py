@@ -0,0 +1,95 @@
+"""On-disk caches keyed by checkpoint contents."""
+
+import hashlib
+import os
+import orjson
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import torch.nn as nn
+
+from streaming.serializer import serialize_topology, serialize_to_json
+
+
+# Bump when the topology message layout changes so stale entries are ignored.
+TOPOLOGY_CACHE_VERSION = 2
+
+_fingerprints: Dict[Tuple[str, int, int], str] = {}
+
+
+def get_cache_dir() -> Path:
+    return Path(os.getenv("RHIZOME_CACHE_DIR", "./cache"))
+
+
+def checkpoint_fingerprint(checkpoint_path) -> Optional[str]:
+    """SHA-256 of a checkpoint file, memoized per (path, mtime, size)."""
+    path = Path(checkpoint_path)
+    if not path.exists():
+        return None
+
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    fingerprint = _fingerprints.get(key)
+
+    if fingerprint is None:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        fingerprint = digest.hexdigest()
+        _fingerprints[key] = fingerprint
+
+    return fingerprint
+
+
+def write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_topology(
+    model: nn.Module,
+    checkpoint_path,
+    threshold: float = 0.1,
+    cache_dir: Optional[Path] = None,
+    top_k: int = 4
+) -> Tuple[bytes, Dict[str, Any]]:
+    """Return the encoded topology message and its metadata.
+
+    The message is read from disk when a checkpoint with identical contents
+    was encoded before with the same threshold and top-k. Untrained models
+    (no checkpoint file) are always built fresh since their weights are random.
+    """
+    fingerprint = checkpoint_fingerprint(checkpoint_path)
+    if fingerprint is None:
+        topology = serialize_topology(model, threshold=threshold, top_k=top_k)
+        return serialize_to_json(topology), topology["metadata"]
+
+    cache_dir = Path(cache_dir) if cache_dir is not None else get_cache_dir()
+    key = f"topology_v{TOPOLOGY_CACHE_VERSION}_{fingerprint[:16]}_{threshold:g}_k{top_k}"
+    message_path = cache_dir / f"{key}.json"
+    metadata_path = cache_dir / f"{key}.meta.json"
+
+    if message_path.exists() and metadata_path.exists():
+        try:
+            metadata = orjson.loads(metadata_path.read_bytes())
+            message = message_path.read_bytes()
+            print(f"✓ Topology loaded from cache ({message_path.name})")
+            return message, metadata
+        except (OSError, orjson.JSONDecodeError) as e:
+            print(f"Warning: Ignoring unreadable topology cache: {e}")
+
+    topology = serialize_topology(model, threshold=threshold, top_k=top_k)
+    message = serialize_to_json(topology)
+    metadata = topology["metadata"]
+
+    try:
+        write_atomic(message_path, message)
+        write_atomic(metadata_path, serialize_to_json(metadata))
+    except OSError as e:
+        print(f"Warning: Could not write topology cache: {e}")
+
+    return message, metadata
@@ -0,0 +1,203 @@
+"""Optional per-message compression negotiated on the /ws handshake.
+
+Every message is compressed on its own, so a client that skips frames
+(latest-wins coalescing, late joiners) can still decode the next one.
+A dictionary trained on sample frames gives the compressor the shared
+header and value patterns up front, which is where most of the gain on
+small messages comes from.
+"""
+
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+CODEC_MAGIC = b"RZCX"
+CODEC_VERSION = 1
+
+# magic, version, codec id, reserved, dictionary length
+_CODEC_HEADER = struct.Struct("<4sBBHI")
+
+CODEC_IDS = {
+    "none": 0,
+    "deflate": 1,
+    "zstd": 2,
+}
+
+# Raw deflate can only look back 32 KiB, so a bigger dictionary is wasted.
+DEFLATE_WINDOW = 32 * 1024
+DEFAULT_DICTIONARY_SIZE = 16 * 1024
+
+
+class DeflateCodec:
+    """Raw deflate (no zlib header), optionally primed with a preset dictionary.
+
+    Without a dictionary the output is what browsers decode natively with
+    `DecompressionStream('deflate-raw')`.
+    """
+
+    name = "deflate"
+
+    def __init__(self, level: int = 6, dictionary: bytes = b""):
+        self.level = level
+        self.dictionary = dictionary[-DEFLATE_WINDOW:]
+
+    def compress(self, data: bytes) -> bytes:
+        if self.dictionary:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15, zdict=self.dictionary)
+        else:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes) -> bytes:
+        if self.dictionary:
+            decompressor = zlib.decompressobj(-15, zdict=self.dictionary)
+        else:
+            decompressor = zlib.decompressobj(-15)
+        return decompressor.decompress(data) + decompressor.flush()
+
+
+class ZstdCodec:
+    """Zstandard with an optional trained dictionary; needs the `zstandard` package.
+
+    zstandard compressors are not thread-safe, and frames are compressed on
+    both the producer thread and the event loop, so each thread gets its own.
+    """
+
+    name = "zstd"
+
+    def __init__(self, level: int = 3, dictionary: bytes = b""):
+        import zstandard
+
+        self.level = level
+        self.dictionary = dictionary
+        self._dict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        self._zstd = zstandard
+        self._local = threading.local()
+
+    def _compressor(self):
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = self._zstd.ZstdCompressor(level=self.level, dict_data=self._dict)
+            self._local.compressor = compressor
+        return compressor
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor().compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._zstd.ZstdDecompressor(dict_data=self._dict).decompress(data)
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_codecs() -> List[str]:
+    return ["deflate", "zstd"] if zstd_available() else ["deflate"]
+
+
+def train_dictionary(codec: str, samples: List[bytes], size: int = DEFAULT_DICTIONARY_SIZE) -> bytes:
+    """Build a dictionary for `codec` from representative encoded frames."""
+    if not samples:
+        return b""
+
+    if codec == "zstd":
+        import zstandard
+
+        try:
+            return zstandard.train_dictionary(size, samples).as_bytes()
+        except zstandard.ZstdError:
+            # Too few or too uniform samples to train; fall back to raw content.
+            pass
+
+    # Deflate has no trainer: the dictionary is simply bytes the compressor
+    # may reference, so use the most recent samples, newest last (closest).
+    size = min(size, DEFLATE_WINDOW) if codec == "deflate" else size
+    return b"".join(samples)[-size:]
+
+
+def make_codec(name: str, dictionary: bytes = b"", level: Optional[int] = None):
+    if name == "deflate":
+        return DeflateCodec(level if level is not None else 6, dictionary)
+    if name == "zstd":
+        return ZstdCodec(level if level is not None else 3, dictionary)
+    raise ValueError(f"Unknown codec: {name}")
+
+
+class CompressedMessages:
+    """Fixed messages (e.g. the topology), compressed at most once per codec."""
+
+    def __init__(self, messages: List[bytes]):
+        self.messages = list(messages)
+        self._compressed: Dict[Any, List[bytes]] = {}
+
+    def get(self, codec=None) -> List[bytes]:
+        if codec is None:
+            return self.messages
+        compressed = self._compressed.get(codec)
+        if compressed is None:
+            compressed = self._compressed[codec] = [codec.compress(message) for message in self.messages]
+        return compressed
+
+
+class CodecRegistry:
+    """A stream's codecs by (name, format, dictionary), each trained once.
+
+    `sample_messages(fmt, count)` returns encoded frames to train on.
+    """
+
+    def __init__(self, sample_messages: Callable[[str, int], List[bytes]]):
+        self.sample_messages = sample_messages
+        self.codecs: Dict[tuple, Any] = {}
+        self.lock = threading.Lock()
+
+    def get(self, name: str, fmt: str, use_dictionary: bool = True):
+        """Shared codec for `name` and `fmt`, or None when unavailable."""
+        if name == "none":
+            return None
+
+        key = (name, fmt, use_dictionary)
+        with self.lock:
+            codec = self.codecs.get(key)
+            if codec is not None:
+                return codec
+
+            dictionary = b""
+            if use_dictionary:
+                samples = int(os.getenv("RHIZOME_CODEC_DICT_SAMPLES", "128"))
+                dictionary = train_dictionary(name, self.sample_messages(fmt, samples))
+
+            try:
+                codec = make_codec(name, dictionary)
+            except ImportError as e:
+                print(f"Warning: {name} compression unavailable ({e}), sending uncompressed")
+                return None
+
+            self.codecs[key] = codec
+            print(f"✓ {name} codec for {fmt} ready (dictionary {len(dictionary)} bytes)")
+            return codec
+
+
+def requested_codec(params: Mapping[str, str]) -> Optional[str]:
+    """Codec a client asked for with `?compression=`, "none" if unsupported, None if not asked."""
+    value = params.get("compression", "").lower()
+    if not value:
+        return None
+    return value if value in available_codecs() else "none"
+
+
+def encode_codec_announcement(codec) -> bytes:
+    """First message on a compressed stream: the codec in use and its dictionary.
+
+    Sent uncompressed; every later binary message is compressed with it.
+    """
+    name = codec.name if codec is not None else "none"
+    dictionary = codec.dictionary if codec is not None else b""
+    header = _CODEC_HEADER.pack(CODEC_MAGIC, CODEC_VERSION, CODEC_IDS[name], 0, len(dictionary))
+    return header + dictionary
@@ -0,0 +1,78 @@
+"""Per-client keyframe/delta encoding of activation frames."""
+
+import numpy as np
+from typing import Optional
+
+from streaming.serializer import (
+    FRAME_DTYPES,
+    dequantize_values,
+    encode_delta_frame,
+    quantize_values
+)
+
+
+class DeltaEncoder:
+    """Sends a full keyframe every `keyframe_interval` frames and sparse deltas between.
+
+    `reference` mirrors what the client holds after decoding, quantization
+    included, so small errors never accumulate across deltas. A fresh encoder
+    has no reference, which makes a late joiner's first frame a keyframe.
+    With a pooled `level`, deltas are taken between pooled frames.
+    """
+
+    def __init__(
+        self,
+        dtype: str = "f16",
+        keyframe_interval: int = 30,
+        epsilon: float = 0.02,
+        codec=None,
+        level=None
+    ):
+        self.dtype = dtype
+        self.codec = codec
+        self.level = level
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.epsilon = epsilon
+        self.reference: Optional[np.ndarray] = None
+        self.frames_since_keyframe = 0
+
+    def reset(self):
+        self.reference = None
+
+    def _keyframe(self, frame) -> bytes:
+        self.reference = dequantize_values(quantize_values(frame.values, self.dtype))
+        self.frames_since_keyframe = 1
+        return frame.encode(self.dtype, self.codec)
+
+    def encode(self, frame) -> bytes:
+        if self.level is not None:
+            frame = frame.pooled(self.level)
+        values = frame.values
+
+        if (
+            self.reference is None
+            or self.reference.shape != values.shape
+            or self.frames_since_keyframe >= self.keyframe_interval
+        ):
+            return self._keyframe(frame)
+
+        changed = np.flatnonzero(np.abs(values - self.reference) > self.epsilon)
+
+        # A uint16 index per change makes dense deltas larger than a keyframe.
+        value_bytes = np.dtype(FRAME_DTYPES[self.dtype][1]).itemsize
+        if len(changed) * (2 + value_bytes) >= len(values) * value_bytes:
+            return self._keyframe(frame)
+
+        changed_values = values[changed]
+        self.reference[changed] = dequantize_values(quantize_values(changed_values, self.dtype))
+        self.frames_since_keyframe += 1
+
+        message = encode_delta_frame(
+            changed,
+            changed_values,
+            frame=frame.frame,
+            label=frame.label,
+            timestamp=frame.timestamp,
+            dtype=self.dtype
+        )
+        return self.codec.compress(message) if self.codec is not None else message
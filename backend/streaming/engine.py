@@ -1,21 +1,103 @@
 """Streaming engine for activation frames."""
 
 import os
+import numpy as np
 import torch
 import asyncio
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 
 from network.model import RhizomeAutoencoder
 from network.hooks import ActivationCapture
-from network.training import load_checkpoint
+from network.quantization import model_bytes, quantize_dynamic_int8
+from network.training import load_model_weights, weights_path_for
 from data.loader import StreamingMNIST, get_mnist_loaders
-from streaming.serializer import (
-    serialize_topology,
-    serialize_activations,
-    serialize_to_json
-)
+from streaming.broadcast import Broadcaster, SubscriberClosed
+from streaming.buffer import FrameRingBuffer
+from streaming.cache import load_topology
+from streaming.compression import CodecRegistry, CompressedMessages
+from streaming.frames import ActivationFrame, FrameEncoder
+from streaming.lod import LevelsOfDetail
+from streaming.metrics import StreamMetrics
+from streaming.query import ActivationQuery
+from streaming.recording import SessionRecorder, get_recording_dir
+from streaming.scheduler import ClientPacer
+from streaming.store import ActivationStore, open_activation_store
+from streaming.topology import ProgressiveTopology
+
+
+class ModelFrameSource:
+    """Produces frames from batched forward passes of the live model.
+
+    Each forward pass covers `batch_size` samples and is sliced into a ring
+    buffer of ready frames. When the buffer drops below `low_water` a refill
+    is started on a background thread, so the pacing loop normally only pops
+    rows that are already there.
+    """
+
+    def __init__(self, model, capture, data_stream, device, batch_size=256, low_water=None, metrics=None):
+        self.model = model
+        self.capture = capture
+        self.data_stream = data_stream
+        self.device = device
+        self.batch_size = batch_size
+        self.low_water = low_water if low_water is not None else max(1, batch_size // 2)
+        self.metrics = metrics or StreamMetrics()
+
+        self.buffer = FrameRingBuffer(batch_size + self.low_water, sum(capture.layer_sizes))
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rhizome-refill")
+        self._refill: Optional[Future] = None
+
+    def _infer_batch(self):
+        fetch_start = time.perf_counter()
+        images, labels = self.data_stream.get_batch()
+        if images.device != torch.device(self.device):
+            images = images.to(self.device)
+
+        forward_start = time.perf_counter()
+        with torch.no_grad():
+            _ = self.model(images)
+        if images.is_cuda:
+            # Kernels run async; sync so the forward isn't billed to capture.
+            torch.cuda.synchronize(images.device)
+
+        capture_start = time.perf_counter()
+        values = self.capture.get_flat_host(normalize=True)
+        capture_end = time.perf_counter()
+
+        self.buffer.push_batch(values, labels.cpu().numpy())
+
+        self.metrics.data_fetch.observe(forward_start - fetch_start)
+        self.metrics.forward.observe(capture_start - forward_start)
+        self.metrics.capture.observe(capture_end - capture_start)
+
+    def _start_refill(self):
+        if self._refill is None or self._refill.done():
+            self._refill = self.executor.submit(self._infer_batch)
+
+    def prime(self):
+        self._start_refill()
+        self._refill.result()
+
+    def next_frame(self):
+        if len(self.buffer) < self.low_water:
+            self._start_refill()
+
+        frame = self.buffer.pop()
+        while frame is None:
+            # Drained (first frame or inference slower than playback): wait.
+            self._start_refill()
+            self._refill.result()
+            frame = self.buffer.pop()
+
+        return frame
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
 
 class StreamingEngine:
@@ -24,17 +106,47 @@ class StreamingEngine:
         checkpoint_path: str = "./checkpoints/rhizome_autoencoder_latest.pth",
         device: str = "cuda",
         target_fps: int = 30,
-        data_dir: str = "./data/mnist"
+        data_dir: str = "./data/mnist",
+        queue_size: int = 4,
+        topology_threshold: float = 0.1,
+        frame_source: str = "model",
+        batch_size: int = 256,
+        store_dir: Optional[Path] = None,
+        topology_top_k: int = 4,
+        topology_chunk_size: int = 10000,
+        quantize: bool = False
     ):
+        self.checkpoint_path = str(checkpoint_path)
+        self.checkpoint_name = Path(checkpoint_path).stem
         self.device = device if torch.cuda.is_available() else "cpu"
         self.target_fps = target_fps
-        self.frame_time = 1.0 / target_fps
+        self.batch_size = batch_size
+        self.data_dir = data_dir
         self.running = False
+        self.ready = False
+        self.metrics = StreamMetrics()
+        self.streams: Dict[str, ClientPacer] = {}
+        # (format, codec, level) keys broadcast subscribers use; the producer pre-encodes these.
+        self.encode_formats: tuple = ()
+        self._format_counts: Dict[tuple, int] = {}
+        self.codecs = CodecRegistry(
+            lambda fmt, count: [frame.encode(fmt) for frame in self.sample_frames(count)]
+        )
+        # Per-client streams build and encode frames here, one at a time.
+        self.frame_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rhizome-frames")
+        # Broadcast subscribers with per-client encoding state (deltas) encode here.
+        self.encode_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("RHIZOME_ENCODE_WORKERS", "2")),
+            thread_name_prefix="rhizome-encode"
+        )
+        self.recorder: Optional[SessionRecorder] = None
+        self.queries: Dict[str, ActivationQuery] = {}
+        self._query_lock = threading.Lock()
 
         print(f"Loading model from {checkpoint_path}...")
         self.model = RhizomeAutoencoder()
-        if Path(checkpoint_path).exists():
-            load_checkpoint(self.model, checkpoint_path, device=self.device)
+        if Path(checkpoint_path).exists() or weights_path_for(checkpoint_path).exists():
+            load_model_weights(self.model, checkpoint_path, device=self.device)
         else:
             print(f"Warning: Checkpoint not found at {checkpoint_path}, using untrained model")
             self.model = self.model.to(self.device)
@@ -42,100 +154,577 @@ class StreamingEngine:
         self.model.eval()
         print(f"✓ Model loaded on {self.device}")
 
-        self.capture = ActivationCapture(self.model)
-
-        print("Loading MNIST data stream...")
-        train_loader, _ = get_mnist_loaders(batch_size=1, data_dir=data_dir)
-        self.data_stream = StreamingMNIST(train_loader)
+        self.capture = None
 
         print("Generating network topology...")
-        self.topology = serialize_topology(self.model)
-        print(f"✓ Topology: {self.topology['metadata']['total_nodes']} nodes, "
-              f"{self.topology['metadata']['total_connections']} connections")
+        topology_start = time.perf_counter()
+        self.topology_message, self.topology_metadata = load_topology(
+            self.model,
+            checkpoint_path,
+            threshold=topology_threshold,
+            top_k=topology_top_k
+        )
+        self.compressed_topology = CompressedMessages([self.topology_message])
+        self.progressive_topology = ProgressiveTopology(self.topology_message, topology_chunk_size)
+        self.lod = LevelsOfDetail(self.topology_message, int(os.getenv("RHIZOME_LOD_LEVELS", "8")))
+        self.metrics.topology_build_seconds = time.perf_counter() - topology_start
+        print(f"✓ Topology: {self.topology_metadata['total_nodes']} nodes, "
+              f"{self.topology_metadata['total_connections']} connections")
+
+        self.layer_order = self.topology_metadata["layer_order"]
+        self.layer_sizes = self.topology_metadata["layer_sizes"]
+
+        # The topology above is always built from the fp32 weights; only
+        # inference switches to the int8 copy.
+        self.float_model = self.model
+        self.quantized = False
+        if quantize:
+            if self.device != "cpu":
+                print("Warning: int8 quantization is CPU-only, serving the fp32 model")
+            else:
+                self.model = quantize_dynamic_int8(self.float_model)
+                self.quantized = True
+                print("✓ Serving dynamically quantized int8 model")
+
+        self.source = None
+        if frame_source == "store":
+            if Path(checkpoint_path).exists():
+                # The store is keyed by checkpoint only, so it always holds fp32 activations.
+                self.source = open_activation_store(
+                    self.float_model,
+                    checkpoint_path,
+                    store_dir=store_dir,
+                    data_dir=data_dir,
+                    device=self.device
+                )
+                print(f"✓ Serving frames from activation store ({len(self.source)} samples)")
+            else:
+                print("Warning: Activation store needs a checkpoint, falling back to live inference")
+        elif frame_source == "interpolate":
+            from streaming.interpolation import LatentInterpolationSource
+
+            self.capture = ActivationCapture(
+                self.model,
+                flat=True,
+                max_batch=batch_size,
+                pin_memory=self.device == "cuda"
+            )
+            self.source = LatentInterpolationSource(
+                self.model,
+                self.capture,
+                data_dir,
+                self.device,
+                batch_size=batch_size,
+                steps=int(os.getenv("RHIZOME_MORPH_STEPS", "45")),
+                anchors_per_label=int(os.getenv("RHIZOME_MORPH_ANCHORS", "2")),
+                metrics=self.metrics
+            )
+            print(f"✓ Morphing between {len(self.source.anchor_labels)} encoded anchors")
+
+        if self.source is None:
+            print("Loading MNIST data stream...")
+            train_loader, _ = get_mnist_loaders(
+                batch_size=batch_size,
+                data_dir=data_dir,
+                device=self.device
+            )
+            self.data_stream = StreamingMNIST(train_loader)
+            self.capture = ActivationCapture(
+                self.model,
+                flat=True,
+                max_batch=batch_size,
+                pin_memory=self.device == "cuda"
+            )
+            self.source = ModelFrameSource(
+                self.model,
+                self.capture,
+                self.data_stream,
+                self.device,
+                batch_size=batch_size,
+                metrics=self.metrics
+            )
+
+        self.broadcaster = Broadcaster(
+            self.produce_broadcast_frame,
+            target_fps=target_fps,
+            queue_size=queue_size
+        )
 
-    def get_topology_message(self) -> bytes:
-        return serialize_to_json(self.topology)
+    def get_topology_message(self, codec=None) -> bytes:
+        return self.compressed_topology.get(codec)[0]
+
+    def get_topology_messages(self, codec=None, progressive: bool = False) -> List[bytes]:
+        """One full topology message, or the coarse message followed by chunks."""
+        if progressive:
+            return self.progressive_topology.messages(codec)
+        return self.compressed_topology.get(codec)
+
+    def get_codec(self, name: str, fmt: str, use_dictionary: bool = True):
+        """Shared codec for `name` and `fmt`, or None when unavailable."""
+        return self.codecs.get(name, fmt, use_dictionary)
+
+    def sample_frames(self, count: int) -> List[ActivationFrame]:
+        """Frames for codec training; the live source keeps the producer as its only reader."""
+        if isinstance(self.source, ActivationStore):
+            rng = np.random.default_rng(0)
+            indices = rng.choice(len(self.source), size=min(count, len(self.source)), replace=False)
+            rows = [self.source.get(index) for index in indices]
+        else:
+            labels, values = self.get_query("train").activations(("sample", count, 0))
+            rows = zip(values, labels.tolist())
+
+        return [
+            ActivationFrame(values, self.layer_sizes, frame=i, label=int(label), timestamp=0.0)
+            for i, (values, label) in enumerate(rows)
+        ]
+
+    def start_recording(self, directory: Path) -> SessionRecorder:
+        """Record broadcast frames (not per-client streams) to `directory`."""
+        self.stop_recording()
+        self.recorder = SessionRecorder(
+            directory,
+            self.topology_message,
+            self.layer_order,
+            self.layer_sizes,
+            checkpoint=self.checkpoint_name
+        )
+        print(f"✓ Recording frames to {directory}")
+        return self.recorder
+
+    def stop_recording(self):
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+
+    def get_query(self, split: str = "train") -> ActivationQuery:
+        """Query helper for the "train" or "test" split, built on first use."""
+        with self._query_lock:
+            query = self.queries.get(split)
+            if query is None:
+                query = self.queries[split] = ActivationQuery(
+                    self.float_model,
+                    data_dir=self.data_dir,
+                    train=split == "train",
+                    device=self.device,
+                    max_batch=int(os.getenv("RHIZOME_QUERY_MAX_BATCH", "1024")),
+                    cache_size=int(os.getenv("RHIZOME_QUERY_CACHE_SIZE", "32")),
+                    quantize=self.quantized
+                )
+                print(f"✓ Activation query index for {split} split ({len(query)} samples)")
+            return query
+
+    def client_count(self) -> int:
+        return len(self.broadcaster.subscribers) + len(self.streams)
+
+    def memory_bytes(self) -> int:
+        """Rough resident cost of this engine, used for the engine cache budget."""
+        total = model_bytes(self.model) + len(self.topology_message)
+        if self.quantized:
+            total += model_bytes(self.float_model)
+
+        if isinstance(self.source, ModelFrameSource):
+            total += self.source.buffer.values.nbytes + self.source.buffer.labels.nbytes
+            # On CPU the dataset is a shared memory map; on a GPU each engine holds a copy.
+            loader = self.source.data_stream.data_loader if self.source.data_stream else None
+            images = getattr(loader, "images", None)
+            if images is not None and images.device.type != "cpu":
+                total += images.numel() * images.element_size()
+        total += sum(query.memory_bytes() for query in list(self.queries.values()))
+        if self.capture is not None and self.capture.buffer is not None:
+            total += self.capture.buffer.numel() * self.capture.buffer.element_size()
+            if self.capture.host_buffer is not self.capture.buffer:
+                total += self.capture.host_buffer.numel() * self.capture.host_buffer.element_size()
+        return total
+
+    def warmup(self, passes: int = 3):
+        """Run throwaway forward passes and fill the frame buffer before serving."""
+        if self.ready:
+            return
+
+        start = time.time()
+        sample = torch.zeros(self.batch_size, 784, device=self.device)
+        with torch.no_grad():
+            for _ in range(passes):
+                self.model(sample)
+
+        if hasattr(self.source, "prime"):
+            self.source.prime()
+
+        self.ready = True
+        print(f"✓ Engine warm ({passes} passes, {time.time() - start:.2f}s)")
+
+    def produce_frame(self, frame_count: int, timestamp: float) -> ActivationFrame:
+        fetch_start = time.perf_counter()
+        values, label = self.source.next_frame()
+        self.metrics.frame_fetch.observe(time.perf_counter() - fetch_start)
+
+        return ActivationFrame(
+            values,
+            self.layer_sizes,
+            frame=frame_count,
+            label=label,
+            timestamp=timestamp
+        )
 
-    async def stream_activations(self, websocket):
+    def produce_broadcast_frame(self, frame_count: int, timestamp: float) -> ActivationFrame:
+        """Runs on the broadcast worker: build the frame and encode it for every
+        format and level of detail a subscriber wants, so subscribers only
+        read memoized bytes."""
+        frame = self.produce_frame(frame_count, timestamp)
+        for fmt, codec, level in self.encode_formats:
+            encode_start = time.perf_counter()
+            (frame if level is None else frame.pooled(level)).encode(fmt, codec)
+            self.metrics.encode.observe(time.perf_counter() - encode_start)
+
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.append(frame)
+        return frame
+
+    def _next_message(self, encoder, frame_count: int, timestamp: float):
+        frame = self.produce_frame(frame_count, timestamp)
+        encode_start = time.perf_counter()
+        message = encoder.encode(frame)
+        return message, time.perf_counter() - encode_start
+
+    def _track_format(self, encoder, delta: int):
+        if not isinstance(encoder, FrameEncoder):
+            return
+        key = (encoder.format, encoder.codec, encoder.level)
+        count = self._format_counts.get(key, 0) + delta
+        if count > 0:
+            self._format_counts[key] = count
+        else:
+            self._format_counts.pop(key, None)
+        # Swap in a new tuple so the worker never iterates a dict being changed.
+        self.encode_formats = tuple(self._format_counts)
+
+    async def broadcast_activations(self, websocket, encoder=None, client: str = "", preamble=None):
+        """Forward frames from the shared producer until the client leaves.
+
+        Only the newest queued frame is sent (latest wins), and the client's
+        pacer lowers its rate while sends are slow or frames back up.
+        Messages in `preamble` (e.g. topology chunks) go out one per frame,
+        ahead of it, so they never hold back the first frames.
+        """
+        encoder = encoder or FrameEncoder()
+        preamble = list(preamble or ())
+        metrics = self.metrics
+        subscriber = self.broadcaster.subscribe(name=client)
+        pacer = ClientPacer(self.target_fps)
+        subscriber.pacer = pacer
+        self._track_format(encoder, 1)
+        # The producer pre-encodes shared formats; anything else is encoded off the loop.
+        pre_encoded = isinstance(encoder, FrameEncoder)
+        loop = asyncio.get_running_loop()
+        print(f"Subscribed to broadcast ({len(self.broadcaster.subscribers)} clients)")
+
+        try:
+            while True:
+                frame = await subscriber.get_latest()
+                if preamble:
+                    await websocket.send_bytes(preamble.pop(0))
+
+                encode_start = time.perf_counter()
+                if pre_encoded:
+                    message = encoder.encode(frame)
+                else:
+                    message = await loop.run_in_executor(self.encode_executor, encoder.encode, frame)
+
+                send_start = time.perf_counter()
+                await websocket.send_bytes(message)
+                send_end = time.perf_counter()
+
+                metrics.serialize.observe(send_start - encode_start)
+                metrics.send.observe(send_end - send_start)
+                metrics.frames_sent.inc()
+                metrics.bytes_sent.inc(len(message))
+                pacer.record_send(send_end - send_start, len(message), len(subscriber.queue))
+
+                await pacer.wait()
+        except SubscriberClosed:
+            if subscriber.error is not None:
+                print(f"Closing {client}: broadcast producer failed: {subscriber.error!r}")
+                await websocket.close(code=1011, reason="Activation producer failed")
+        finally:
+            self._track_format(encoder, -1)
+            self.broadcaster.unsubscribe(subscriber)
+            stats = subscriber.stats()
+            metrics.retire_client(stats)
+            print(f"Subscriber {client} stats: {stats}")
+
+    def client_stats(self) -> List[Dict[str, Any]]:
+        stats = [subscriber.stats() for subscriber in self.broadcaster.subscribers]
+        stats.extend({"client": client, **pacer.stats()} for client, pacer in self.streams.items())
+        for client in stats:
+            client["checkpoint"] = self.checkpoint_name
+        return stats
+
+    async def stream_activations(self, websocket, encoder=None, client: str = "", preamble=None):
         print(f"Starting activation stream (target: {self.target_fps} FPS)...")
+        encoder = encoder or FrameEncoder()
+        preamble = list(preamble or ())
+        metrics = self.metrics
         self.running = True
 
         frame_count = 0
-        start_time = time.time()
+        pacer = ClientPacer(self.target_fps)
+        scheduler = pacer.scheduler
+        self.streams[client] = pacer
+        loop = asyncio.get_running_loop()
 
         try:
             while self.running:
-                frame_start = time.time()
-
-                sample, label = self.data_stream.get_single()
-
-                sample = sample.unsqueeze(0)
-                if sample.device != torch.device(self.device):
-                    sample = sample.to(self.device)
-
-                with torch.no_grad():
-                    _ = self.model(sample)
-
-                activations = self.capture.get_activations(normalize=True)
-
-                timestamp = time.time() - start_time
-                activation_frame = serialize_activations(
-                    activations,
-                    timestamp=timestamp,
-                    batch_idx=0
+                # Inference and encoding run off the event loop.
+                message, encode_seconds = await loop.run_in_executor(
+                    self.frame_executor,
+                    self._next_message,
+                    encoder,
+                    frame_count,
+                    scheduler.elapsed()
                 )
+                if preamble:
+                    await websocket.send_bytes(preamble.pop(0))
 
-                activation_frame["frame"] = frame_count
-                activation_frame["label"] = int(label.item())
-
-                message = serialize_to_json(activation_frame)
+                send_start = time.perf_counter()
                 await websocket.send_bytes(message)
+                send_end = time.perf_counter()
 
-                frame_count += 1
+                metrics.serialize.observe(encode_seconds)
+                metrics.send.observe(send_end - send_start)
+                metrics.frames_sent.inc()
+                metrics.bytes_sent.inc(len(message))
+                pacer.record_send(send_end - send_start, len(message), 0)
 
-                elapsed = time.time() - frame_start
-                sleep_time = max(0, self.frame_time - elapsed)
+                frame_count += 1
 
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
+                await scheduler.wait()
 
                 if frame_count % 100 == 0:
-                    total_elapsed = time.time() - start_time
-                    actual_fps = frame_count / total_elapsed
+                    actual_fps = frame_count / scheduler.elapsed()
                     print(f"Frame {frame_count} | FPS: {actual_fps:.1f} | "
-                          f"Label: {label.item()}")
+                          f"Effective FPS: {pacer.fps:.1f}")
 
         except Exception as e:
             print(f"Stream error: {e}")
             raise
         finally:
-            self.running = False
+            self.streams.pop(client, None)
             print(f"Stream ended. Total frames: {frame_count}")
 
     def stop(self):
         self.running = False
-        self.capture.remove_hooks()
+        broadcaster = getattr(self, "broadcaster", None)
+        if broadcaster is not None:
+            broadcaster.stop()
+        if getattr(self, "recorder", None) is not None:
+            self.stop_recording()
+        for query in getattr(self, "queries", {}).values():
+            query.close()
+        for name in ("frame_executor", "encode_executor"):
+            executor = getattr(self, name, None)
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        source = getattr(self, "source", None)
+        if hasattr(source, "close"):
+            source.close()
+        if getattr(self, "capture", None) is not None:
+            self.capture.remove_hooks()
 
     def __del__(self):
         self.stop()
 
 
-_engine: Optional[StreamingEngine] = None
+DEFAULT_CHECKPOINT_PATH = "./checkpoints/rhizome_autoencoder_latest.pth"
 
 
-def get_engine() -> StreamingEngine:
-    global _engine
+def default_checkpoint_path() -> str:
+    return os.getenv("RHIZOME_CHECKPOINT_PATH", DEFAULT_CHECKPOINT_PATH)
+
+
+def checkpoint_dir() -> Path:
+    return Path(os.getenv("RHIZOME_CHECKPOINT_DIR", Path(default_checkpoint_path()).parent)).resolve()
+
+
+def resolve_checkpoint(name: Optional[str] = None) -> str:
+    """Map a client-supplied checkpoint name to a file in the checkpoint directory.
+
+    `name` is a file name with or without `.pth` (e.g. `rhizome_autoencoder_epoch_10`);
+    anything outside RHIZOME_CHECKPOINT_DIR or not on disk is rejected.
+    """
+    if not name:
+        return str(Path(default_checkpoint_path()).resolve())
+
+    root = checkpoint_dir()
+    candidate = root / (name if name.endswith(".pth") else f"{name}.pth")
+    candidate = candidate.resolve()
+
+    if (
+        candidate.parent != root
+        or candidate.name.endswith(".weights.pth")
+        or not (candidate.exists() or weights_path_for(candidate).exists())
+    ):
+        raise ValueError(f"Unknown checkpoint: {name}")
+    return str(candidate)
+
+
+def list_checkpoints() -> List[str]:
+    root = checkpoint_dir()
+    if not root.exists():
+        return []
+    return sorted(
+        path.stem for path in root.glob("*.pth")
+        if not path.name.endswith(".weights.pth")
+    )
+
+
+def build_engine(checkpoint_path: str) -> StreamingEngine:
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    data_dir = os.getenv("RHIZOME_DATA_DIR", "./data/mnist")
+    target_fps = int(os.getenv("RHIZOME_TARGET_FPS", "30"))
+    queue_size = int(os.getenv("RHIZOME_CLIENT_QUEUE_SIZE", "4"))
+    topology_threshold = float(os.getenv("RHIZOME_TOPOLOGY_THRESHOLD", "0.1"))
+    topology_top_k = int(os.getenv("RHIZOME_TOPOLOGY_TOP_K", "4"))
+    topology_chunk_size = int(os.getenv("RHIZOME_TOPOLOGY_CHUNK_SIZE", "10000"))
+    frame_source = os.getenv("RHIZOME_FRAME_SOURCE", "model")
+    batch_size = int(os.getenv("RHIZOME_BATCH_SIZE", "256"))
+    quantize = os.getenv("RHIZOME_QUANTIZE", "none").lower() == "int8"
+    passes = int(os.getenv("RHIZOME_WARMUP_PASSES", "3"))
+
+    engine = StreamingEngine(
+        checkpoint_path=checkpoint_path,
+        device=device,
+        target_fps=target_fps,
+        data_dir=data_dir,
+        queue_size=queue_size,
+        topology_threshold=topology_threshold,
+        topology_top_k=topology_top_k,
+        topology_chunk_size=topology_chunk_size,
+        frame_source=frame_source,
+        batch_size=batch_size,
+        quantize=quantize
+    )
+    engine.warmup(passes)
+
+    # One new recording per engine load, named after the checkpoint and start time.
+    if os.getenv("RHIZOME_RECORD", "0") != "0":
+        name = f"{engine.checkpoint_name}-{time.strftime('%Y%m%d-%H%M%S')}"
+        engine.start_recording(get_recording_dir() / name)
+    return engine
+
+
+class EngineCache:
+    """LRU of warm engines by checkpoint path, bounded by a memory budget.
+
+    Engines with clients attached are never evicted.
+    """
+
+    def __init__(self, budget_bytes: int, factory: Callable[[str], StreamingEngine] = build_engine):
+        self.budget_bytes = budget_bytes
+        self.factory = factory
+        self.entries: "OrderedDict[str, StreamingEngine]" = OrderedDict()
+        self.loading: Dict[str, Future] = {}
+        self.lock = threading.Lock()
+        # Counters of evicted engines, so /metrics totals don't go backwards.
+        self.retired = StreamMetrics()
+
+    def get(self, checkpoint_path: str) -> StreamingEngine:
+        with self.lock:
+            engine = self.entries.get(checkpoint_path)
+            if engine is not None:
+                self.entries.move_to_end(checkpoint_path)
+                return engine
+
+            future = self.loading.get(checkpoint_path)
+            owner = future is None
+            if owner:
+                future = self.loading[checkpoint_path] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            engine = self.factory(checkpoint_path)
+        except BaseException as e:
+            with self.lock:
+                del self.loading[checkpoint_path]
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            del self.loading[checkpoint_path]
+            self.entries[checkpoint_path] = engine
+            evicted = self._evict(keep=checkpoint_path)
+            for old in evicted:
+                self.retired = StreamMetrics.combine([self.retired, old.metrics])
+        future.set_result(engine)
+
+        for old in evicted:
+            print(f"Evicted engine for {old.checkpoint_path} ({old.memory_bytes() / 2**20:.1f} MiB)")
+        return engine
+
+    def peek(self, checkpoint_path: str) -> Optional[StreamingEngine]:
+        return self.entries.get(checkpoint_path)
+
+    def engines(self) -> List[StreamingEngine]:
+        return list(self.entries.values())
+
+    def memory_bytes(self) -> int:
+        return sum(engine.memory_bytes() for engine in self.entries.values())
+
+    def _evict(self, keep: str) -> List[StreamingEngine]:
+        evicted = []
+        total = self.memory_bytes()
+        for path in list(self.entries):
+            if total <= self.budget_bytes:
+                break
+            engine = self.entries[path]
+            if path == keep or engine.client_count():
+                continue
+            total -= engine.memory_bytes()
+            evicted.append(self.entries.pop(path))
+        return evicted
+
+    def clear(self):
+        with self.lock:
+            engines = list(self.entries.values())
+            self.entries.clear()
+        for engine in engines:
+            engine.stop()
+
+
+_engines = EngineCache(int(float(os.getenv("RHIZOME_MODEL_CACHE_MB", "1024")) * 2**20))
+
+
+def get_engine(checkpoint: Optional[str] = None) -> StreamingEngine:
+    """The warm engine for `checkpoint` (a name from `list_checkpoints`), loading it if needed."""
+    return _engines.get(resolve_checkpoint(checkpoint))
+
+
+def peek_engine(checkpoint: Optional[str] = None) -> Optional[StreamingEngine]:
+    """The engine for `checkpoint` if it is loaded, without loading it."""
+    try:
+        return _engines.peek(resolve_checkpoint(checkpoint))
+    except ValueError:
+        return None
+
+
+def loaded_engines() -> List[StreamingEngine]:
+    return _engines.engines()
+
+
+def engine_cache() -> EngineCache:
+    return _engines
+
+
+def warm_up_engine(checkpoint: Optional[str] = None) -> StreamingEngine:
+    """Build and warm the engine for `checkpoint` if needed; safe to call repeatedly."""
+    return get_engine(checkpoint)
 
-    if _engine is None:
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        checkpoint_path = os.getenv("RHIZOME_CHECKPOINT_PATH", "./checkpoints/rhizome_autoencoder_latest.pth")
-        data_dir = os.getenv("RHIZOME_DATA_DIR", "./data/mnist")
-        target_fps = int(os.getenv("RHIZOME_TARGET_FPS", "30"))
-        _engine = StreamingEngine(
-            checkpoint_path=checkpoint_path,
-            device=device,
-            target_fps=target_fps,
-            data_dir=data_dir
-        )
 
-    return _engine
+def render_metrics() -> str:
+    engines = loaded_engines()
+    metrics = StreamMetrics.combine([_engines.retired] + [engine.metrics for engine in engines])
+    clients = [client for engine in engines for client in engine.client_stats()]
+    topology = {engine.checkpoint_name: engine.metrics.topology_build_seconds for engine in engines}
+    return metrics.render(clients, topology)
@@ -0,0 +1,153 @@
+"""Activation frames shared by every client of a stream."""
+
+import os
+import numpy as np
+from typing import Any, Dict, List, Mapping
+
+from streaming.delta import DeltaEncoder
+from streaming.serializer import (
+    FRAME_DTYPES,
+    encode_activation_frame,
+    serialize_to_json
+)
+
+
+FRAME_FORMATS = ("json",) + tuple(FRAME_DTYPES)
+
+FORMAT_ALIASES = {
+    "binary": "f16",
+    "float16": "f16",
+    "uint8": "u8",
+}
+
+
+def resolve_format(value: str) -> str:
+    """Map a client-requested format to a supported one, falling back to JSON."""
+    if not value:
+        return "json"
+    fmt = FORMAT_ALIASES.get(value.lower(), value.lower())
+    return fmt if fmt in FRAME_FORMATS else "json"
+
+
+def _query_number(params: Mapping[str, str], key: str, default, cast):
+    try:
+        return cast(params[key])
+    except (KeyError, ValueError):
+        return default
+
+
+def build_encoder(params: Mapping[str, str], codec=None, level=None):
+    """Pick a per-client frame encoder from the /ws query parameters.
+
+    `codec` is the negotiated compression codec, if any; `level` the
+    client's pooled level of detail (see `streaming.lod`), if any.
+    """
+    fmt = resolve_format(params.get("format", "json"))
+
+    if fmt != "json" and params.get("encoding", "").lower() == "delta":
+        keyframe_interval = _query_number(
+            params, "keyframe", int(os.getenv("RHIZOME_KEYFRAME_INTERVAL", "30")), int
+        )
+        epsilon = _query_number(
+            params, "epsilon", float(os.getenv("RHIZOME_DELTA_EPSILON", "0.02")), float
+        )
+        return DeltaEncoder(
+            dtype=fmt,
+            keyframe_interval=min(max(keyframe_interval, 1), 600),
+            epsilon=min(max(epsilon, 0.0), 1.0),
+            codec=codec,
+            level=level
+        )
+
+    return FrameEncoder(fmt, codec, level)
+
+
+class FrameEncoder:
+    """Stateless encoder that reuses the frame's memoized encoding."""
+
+    def __init__(self, fmt: str = "json", codec=None, level=None):
+        self.format = fmt
+        self.codec = codec
+        self.level = level
+
+    def encode(self, frame) -> bytes:
+        if self.level is not None:
+            frame = frame.pooled(self.level)
+        return frame.encode(self.format, self.codec)
+
+
+class ActivationFrame:
+    """One normalized forward pass, flattened in topology node order.
+
+    Encodings are memoized, so a frame fanned out to many clients is
+    serialized (and compressed) at most once per wire format and codec.
+    Pooled levels of detail are memoized the same way.
+    """
+
+    __slots__ = ("values", "layer_sizes", "frame", "label", "timestamp", "_encoded", "_pooled")
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        layer_sizes: List[int],
+        frame: int,
+        label: int,
+        timestamp: float
+    ):
+        self.values = values
+        self.layer_sizes = layer_sizes
+        self.frame = frame
+        self.label = label
+        self.timestamp = timestamp
+        self._encoded: Dict[Any, bytes] = {}
+        self._pooled: Dict[Any, "ActivationFrame"] = {}
+
+    def pooled(self, level) -> "ActivationFrame":
+        """This frame pooled to `level`, computed once per level."""
+        frame = self._pooled.get(level)
+        if frame is None:
+            frame = self._pooled[level] = ActivationFrame(
+                level.pool(self.values),
+                level.layer_sizes,
+                frame=self.frame,
+                label=self.label,
+                timestamp=self.timestamp
+            )
+        return frame
+
+    def encode(self, fmt: str = "json", codec=None) -> bytes:
+        if codec is not None:
+            key = (fmt, codec)
+            message = self._encoded.get(key)
+            if message is None:
+                message = self._encoded[key] = codec.compress(self.encode(fmt))
+            return message
+
+        message = self._encoded.get(fmt)
+        if message is None:
+            if fmt == "json":
+                message = serialize_to_json(self.to_dict())
+            else:
+                message = encode_activation_frame(
+                    self.values,
+                    self.layer_sizes,
+                    frame=self.frame,
+                    label=self.label,
+                    timestamp=self.timestamp,
+                    dtype=fmt
+                )
+            self._encoded[fmt] = message
+        return message
+
+    def to_dict(self) -> Dict[str, Any]:
+        activations = {
+            f"node_{node_id}": value
+            for node_id, value in enumerate(self.values.tolist())
+        }
+        return {
+            "type": "activation",
+            "timestamp": self.timestamp,
+            "activations": activations,
+            "frame": self.frame,
+            "label": self.label
+        }
@@ -0,0 +1,108 @@
+"""Frames that morph between digits by interpolating in latent space."""
+
+import time
+import numpy as np
+import torch
+
+from data.loader import TensorMNIST
+from network.hooks import ActivationCapture
+from streaming.engine import ModelFrameSource
+
+
+class LatentInterpolationSource(ModelFrameSource):
+    """Morphs between anchor digits, running only the decoder per frame.
+
+    Anchors are encoded once; each frame decodes a smoothstep blend of two
+    anchor latents and blends the cached encoder outputs.
+    """
+
+    def __init__(
+        self,
+        model,
+        capture: ActivationCapture,
+        data_dir: str,
+        device: str,
+        batch_size: int = 256,
+        steps: int = 45,
+        anchors_per_label: int = 2,
+        seed: int = 0,
+        metrics=None
+    ):
+        super().__init__(model, capture, None, device, batch_size=batch_size, metrics=metrics)
+        self.steps = max(1, steps)
+        self.rng = np.random.default_rng(seed)
+
+        # Encoder layers come first in topology order, so they are a prefix of each row.
+        self.encoder_width = sum(
+            size for name, size in zip(capture.layer_order, capture.layer_sizes)
+            if name.startswith("encoder.")
+        )
+
+        dataset = TensorMNIST(data_dir, train=True, shuffle=False, device="cpu")
+        labels = dataset.labels.cpu().numpy()
+        picks = np.concatenate([
+            self.rng.choice(np.flatnonzero(labels == label), anchors_per_label, replace=False)
+            for label in np.unique(labels)
+        ])
+        images, anchor_labels = dataset.batch(torch.from_numpy(picks))
+
+        with torch.no_grad():
+            self.latents = model.encoder(images.to(device))
+        self.encoder_outputs = capture.get_flat(normalize=False)[:, :self.encoder_width].clone()
+        self.anchor_labels = anchor_labels.cpu().numpy()
+
+        self.order = self.rng.permutation(len(picks))
+        self.position = 0  # frames emitted along `order`
+
+    def _anchor_pairs(self, count: int):
+        """(from, to, weight) anchor indices for the next `count` frames."""
+        consumed = self.position // self.steps
+        if consumed:
+            self.order = self.order[consumed:]
+            self.position -= consumed * self.steps
+
+        steps = self.position + np.arange(count)
+        segment, step = np.divmod(steps, self.steps)
+
+        # Extend the visiting order with a fresh shuffle once it runs out,
+        # never repeating the anchor it currently ends on.
+        while segment[-1] + 1 >= len(self.order):
+            following = self.rng.permutation(len(self.anchor_labels))
+            following = following[following != self.order[-1]]
+            self.order = np.concatenate([self.order, following])
+
+        t = step / self.steps
+        weight = t * t * (3 - 2 * t)
+        return self.order[segment], self.order[segment + 1], weight.astype(np.float32)
+
+    def _infer_batch(self):
+        fetch_start = time.perf_counter()
+        count = min(self.batch_size, self.buffer.free())
+        if count == 0:
+            return
+        source, target, weight = self._anchor_pairs(count)
+
+        src = torch.from_numpy(source).to(self.latents.device)
+        dst = torch.from_numpy(target).to(self.latents.device)
+        w = torch.from_numpy(weight).to(self.latents.device).unsqueeze(1)
+        latents = torch.lerp(self.latents[src], self.latents[dst], w)
+        encoder_outputs = torch.lerp(self.encoder_outputs[src], self.encoder_outputs[dst], w)
+
+        forward_start = time.perf_counter()
+        with torch.no_grad():
+            _ = self.model.decoder(latents)
+        if latents.is_cuda:
+            torch.cuda.synchronize(latents.device)
+
+        capture_start = time.perf_counter()
+        # The decoder hooks filled the decoder columns; the encoder columns come from the cache.
+        self.capture.buffer[:count, :self.encoder_width].copy_(encoder_outputs)
+        values = self.capture.get_flat_host(normalize=True)
+        capture_end = time.perf_counter()
+
+        labels = np.where(weight < 0.5, self.anchor_labels[source], self.anchor_labels[target])
+        self.position += self.buffer.push_batch(values, labels)
+
+        self.metrics.data_fetch.observe(forward_start - fetch_start)
+        self.metrics.forward.observe(capture_start - forward_start)
+        self.metrics.capture.observe(capture_end - capture_start)
@@ -0,0 +1,145 @@
+"""Pooled (low-bandwidth) levels of detail for the activation stream."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import orjson
+
+from streaming.compression import CompressedMessages
+from streaming.serializer import serialize_to_json
+
+
+POOL_MODES = ("mean", "max")
+
+
+def parse_lod(params: Mapping[str, str]) -> Optional[Tuple[int, str]]:
+    """(buckets, mode) from the `lod`/`pool` params, or None for full detail."""
+    value = params.get("lod")
+    if not value:
+        return None
+    try:
+        buckets = int(value)
+    except ValueError:
+        raise ValueError("lod must be a bucket count per layer")
+    if buckets < 1:
+        raise ValueError("lod must be at least 1")
+
+    mode = params.get("pool", "mean").lower()
+    if mode not in POOL_MODES:
+        raise ValueError(f"pool must be one of {', '.join(POOL_MODES)}")
+    return buckets, mode
+
+
+class PooledLevel:
+    """Every layer pooled into at most `buckets` contiguous node runs.
+
+    Connections between two buckets merge into one with their mean weight.
+    """
+
+    def __init__(self, topology: Dict[str, Any], buckets: int, mode: str = "mean"):
+        metadata = topology["metadata"]
+        self.buckets = buckets
+        self.mode = mode
+
+        layer_order = metadata["layer_order"]
+        source_sizes = metadata["layer_sizes"]
+        self.layer_sizes = [min(buckets, size) for size in source_sizes]
+
+        starts = []
+        offset = 0
+        for size, pooled in zip(source_sizes, self.layer_sizes):
+            starts.append(offset + np.arange(pooled) * size // pooled)
+            offset += size
+        self.starts = np.concatenate(starts)
+        self.counts = np.diff(np.append(self.starts, offset)).astype(np.float32)
+        # Pooled node of every source node.
+        node_bucket = np.repeat(np.arange(len(self.starts)), self.counts.astype(np.int64))
+
+        nodes = []
+        for layer, pooled in zip(layer_order, self.layer_sizes):
+            for index in range(pooled):
+                node_id = len(nodes)
+                start = int(self.starts[node_id])
+                nodes.append({
+                    "id": f"node_{node_id}",
+                    "layer": layer,
+                    "index": index,
+                    "members": [start, start + int(self.counts[node_id])]
+                })
+
+        connections = topology["connections"]
+        source = node_bucket[np.asarray(connections["source"], dtype=np.int64)]
+        target = node_bucket[np.asarray(connections["target"], dtype=np.int64)]
+        weight = np.asarray(connections["weight"], dtype=np.float64)
+
+        pairs, inverse = np.unique(source * len(nodes) + target, return_inverse=True)
+        merged = (np.bincount(inverse, weights=weight) / np.bincount(inverse)).astype(np.float32)
+        order = np.argsort(-np.abs(merged), kind="stable")
+
+        self.topology = {
+            "type": "topology",
+            "nodes": nodes,
+            "connections": {
+                "source": (pairs[order] // len(nodes)).astype(np.int32),
+                "target": (pairs[order] % len(nodes)).astype(np.int32),
+                "weight": merged[order]
+            },
+            "metadata": dict(
+                metadata,
+                total_nodes=len(nodes),
+                total_connections=len(pairs),
+                layer_sizes=self.layer_sizes,
+                # Small enough to send whole: every connection is in the coarse level.
+                lod=dict(metadata.get("lod", {}), coarse_connections=len(pairs)),
+                pooling={
+                    "buckets": buckets,
+                    "mode": mode,
+                    "source_nodes": metadata["total_nodes"],
+                    "source_layer_sizes": source_sizes
+                }
+            )
+        }
+        self.topology_message = serialize_to_json(self.topology)
+        self.compressed_topology = CompressedMessages([self.topology_message])
+
+    def pool(self, values: np.ndarray) -> np.ndarray:
+        """Pool one flat frame into this level's nodes."""
+        if self.mode == "max":
+            return np.maximum.reduceat(values, self.starts)
+        return np.add.reduceat(values, self.starts) / self.counts
+
+    def messages(self, codec=None) -> List[bytes]:
+        """The pooled topology, compressed once per codec."""
+        return self.compressed_topology.get(codec)
+
+
+class LevelsOfDetail:
+    """LRU of pooled levels; clients at the same level share one `PooledLevel`."""
+
+    def __init__(self, topology_message: bytes, max_levels: int = 8):
+        self.topology_message = topology_message
+        self.max_levels = max(1, max_levels)
+        self.levels: "OrderedDict[Tuple[int, str], PooledLevel]" = OrderedDict()
+        self._topology: Optional[Dict[str, Any]] = None
+        self.lock = threading.Lock()
+
+    def get(self, buckets: int, mode: str = "mean") -> PooledLevel:
+        """The shared level for `buckets` per layer and `mode`."""
+        key = (buckets, mode)
+        with self.lock:
+            level = self.levels.get(key)
+            if level is not None:
+                self.levels.move_to_end(key)
+                return level
+
+            if self._topology is None:
+                self._topology = orjson.loads(self.topology_message)
+            level = self.levels[key] = PooledLevel(self._topology, buckets, mode)
+            while len(self.levels) > self.max_levels:
+                self.levels.popitem(last=False)
+
+        print(f"✓ Level of detail {buckets}/{mode}: {level.topology['metadata']['total_nodes']} nodes, "
+              f"{level.topology['metadata']['total_connections']} connections")
+        return level
@@ -0,0 +1,225 @@
+"""Lock-free per-stage metrics, exported in the Prometheus text format."""
+
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Sequence
+
+# Seconds; covers a sub-0.1ms send up to a stalled one-second batch.
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+
+class _Shard:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram:
+    """Fixed-bucket latency histogram.
+
+    Every writing thread gets its own shard, so `observe` is a bisect and
+    three adds with no lock; shards are summed at scrape time, which may
+    read a count one observation ahead of the buckets.
+    """
+
+    __slots__ = ("name", "help", "bounds", "_local", "_shards", "_shards_lock")
+
+    def __init__(self, name: str, help: str, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.bounds = tuple(bounds)
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            # Once per thread; shards of finished threads keep their totals.
+            shard = self._local.shard = _Shard(len(self.bounds) + 1)
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def observe(self, value: float):
+        shard = self._shard()
+        shard.counts[bisect_left(self.bounds, value)] += 1
+        shard.count += 1
+        shard.sum += value
+
+    def snapshot(self):
+        """(bucket counts, count, sum) summed over every thread's shard."""
+        with self._shards_lock:
+            shards = list(self._shards)
+        counts = [0] * (len(self.bounds) + 1)
+        total, value_sum = 0, 0.0
+        for shard in shards:
+            for i, count in enumerate(shard.counts):
+                counts[i] += count
+            total += shard.count
+            value_sum += shard.sum
+        return counts, total, value_sum
+
+    @property
+    def count(self) -> int:
+        return self.snapshot()[1]
+
+    @property
+    def sum(self) -> float:
+        return self.snapshot()[2]
+
+    def merge(self, other: "Histogram"):
+        counts, total, value_sum = other.snapshot()
+        shard = self._shard()
+        for i, count in enumerate(counts):
+            shard.counts[i] += count
+        shard.count += total
+        shard.sum += value_sum
+
+    def render(self, lines: List[str]):
+        counts, total, value_sum = self.snapshot()
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} histogram")
+        cumulative = 0
+        for bound, count in zip(self.bounds, counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {cumulative + counts[-1]}')
+        lines.append(f"{self.name}_sum {value_sum}")
+        lines.append(f"{self.name}_count {total}")
+
+
+class Counter:
+    __slots__ = ("name", "help", "value")
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+# Process-wide: how late the event loop runs a timer. Stays near zero
+# as long as nothing blocks the loop.
+EVENT_LOOP_LAG = Histogram(
+    "rhizome_event_loop_lag_seconds", "How late the event loop wakes a timer")
+
+
+async def monitor_event_loop(interval: float = 0.25):
+    while True:
+        start = time.monotonic()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, time.monotonic() - start - interval))
+
+
+def _render_scalar(lines: List[str], name: str, kind: str, help: str, value):
+    lines.append(f"# HELP {name} {help}")
+    lines.append(f"# TYPE {name} {kind}")
+    lines.append(f"{name} {value}")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+class StreamMetrics:
+    """Everything `/metrics` reports for one engine.
+
+    The hot path only calls `observe`/`inc` with numbers it already has;
+    names, labels and text are produced at scrape time in `render`.
+    """
+
+    def __init__(self):
+        self.data_fetch = Histogram(
+            "rhizome_data_fetch_seconds", "Time to fetch one input batch")
+        self.forward = Histogram(
+            "rhizome_forward_seconds", "Model forward pass per batch")
+        self.capture = Histogram(
+            "rhizome_capture_seconds", "Activation capture, normalize and host copy per batch")
+        self.frame_fetch = Histogram(
+            "rhizome_frame_fetch_seconds", "Time the pacing loop waits for the next ready frame")
+        self.encode = Histogram(
+            "rhizome_encode_seconds", "Frame encoding on the producer, per wire format")
+        self.serialize = Histogram(
+            "rhizome_serialize_seconds", "Per-client encoding before a send (delta or cache lookup)")
+        self.send = Histogram(
+            "rhizome_send_seconds", "WebSocket send per frame")
+
+        self.frames_sent = Counter("rhizome_frames_sent_total", "Frames sent to clients")
+        self.bytes_sent = Counter("rhizome_bytes_sent_total", "Bytes sent to clients")
+        # Totals from clients that have disconnected; live clients are added at scrape.
+        self.frames_dropped = Counter(
+            "rhizome_frames_dropped_total", "Frames dropped from full client queues")
+        self.frames_coalesced = Counter(
+            "rhizome_frames_coalesced_total", "Queued frames skipped in favour of a newer one")
+
+        self.topology_build_seconds = 0.0
+
+    @property
+    def histograms(self) -> List[Histogram]:
+        return [
+            self.data_fetch, self.forward, self.capture, self.frame_fetch,
+            self.encode, self.serialize, self.send
+        ]
+
+    @classmethod
+    def combine(cls, metrics: Iterable["StreamMetrics"]) -> "StreamMetrics":
+        """Sum the histograms and counters of several engines into one for a scrape."""
+        combined = cls()
+        for item in metrics:
+            for total, histogram in zip(combined.histograms, item.histograms):
+                total.merge(histogram)
+            for name in ("frames_sent", "bytes_sent", "frames_dropped", "frames_coalesced"):
+                getattr(combined, name).inc(getattr(item, name).value)
+        return combined
+
+    def retire_client(self, stats: Dict[str, Any]):
+        self.frames_dropped.inc(stats.get("dropped", 0))
+        self.frames_coalesced.inc(stats.get("coalesced", 0))
+
+    def render(self, clients: List[Dict[str, Any]], topology: Dict[str, float]) -> str:
+        """Prometheus text for these metrics, live `clients` and per-checkpoint topology build times."""
+        lines: List[str] = []
+        for histogram in self.histograms + [EVENT_LOOP_LAG]:
+            histogram.render(lines)
+
+        _render_scalar(lines, self.frames_sent.name, "counter", self.frames_sent.help,
+                       self.frames_sent.value)
+        _render_scalar(lines, self.bytes_sent.name, "counter", self.bytes_sent.help,
+                       self.bytes_sent.value)
+        _render_scalar(lines, self.frames_dropped.name, "counter", self.frames_dropped.help,
+                       self.frames_dropped.value + sum(c.get("dropped", 0) for c in clients))
+        _render_scalar(lines, self.frames_coalesced.name, "counter", self.frames_coalesced.help,
+                       self.frames_coalesced.value + sum(c.get("coalesced", 0) for c in clients))
+        _render_scalar(lines, "rhizome_clients", "gauge", "Connected streaming clients", len(clients))
+
+        lines.append("# HELP rhizome_topology_build_seconds Time to build or load the topology")
+        lines.append("# TYPE rhizome_topology_build_seconds gauge")
+        for checkpoint, seconds in topology.items():
+            lines.append(f'rhizome_topology_build_seconds{{checkpoint="{_escape_label(checkpoint)}"}} {seconds}')
+
+        per_client = (
+            ("rhizome_client_achieved_fps", "Frames per second actually delivered to the client", "achieved_fps"),
+            ("rhizome_client_effective_fps", "Frame rate the client is currently paced at", "effective_fps"),
+            ("rhizome_client_bytes_sent", "Bytes sent to the client", "bytes_sent"),
+        )
+        for name, help, key in per_client:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} gauge")
+            for client in clients:
+                if key in client:
+                    labels = f'client="{_escape_label(client["client"])}",checkpoint="{_escape_label(client["checkpoint"])}"'
+                    lines.append(f"{name}{{{labels}}} {client[key]}")
+
+        lines.append("")
+        return "\n".join(lines)
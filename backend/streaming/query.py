@@ -0,0 +1,187 @@
+"""Random-access activation batches for the /activations endpoint."""
+
+import threading
+import numpy as np
+import torch
+import torch.nn as nn
+from collections import OrderedDict
+from typing import Dict, Mapping, Optional, Tuple
+
+from data.loader import TensorMNIST
+from network.hooks import ActivationCapture
+from network.model import RhizomeAutoencoder
+from network.quantization import model_bytes, quantize_dynamic_int8
+from streaming.serializer import encode_activation_batch, serialize_to_json
+
+
+NUM_LABELS = 10
+
+
+def _param_int(params: Mapping[str, str], key: str, default: Optional[int] = None) -> Optional[int]:
+    value = params.get(key)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{key} must be an integer") from None
+
+
+def parse_query(params: Mapping[str, str], max_batch: int) -> Tuple:
+    """Turn /activations query parameters into a hashable selection.
+
+    One of:
+      `label=7[&offset=0][&limit=N]`  samples of a digit, in dataset order
+      `start=100&end=356`             a dataset index range
+      `sample=N[&seed=S]`             a random sample; cached only with a seed
+    """
+    if "label" in params:
+        label = _param_int(params, "label")
+        if not 0 <= label < NUM_LABELS:
+            raise ValueError(f"label must be between 0 and {NUM_LABELS - 1}")
+        offset = max(0, _param_int(params, "offset", 0))
+        limit = min(max(1, _param_int(params, "limit", max_batch)), max_batch)
+        return ("label", label, offset, limit)
+
+    if "start" in params:
+        start = max(0, _param_int(params, "start"))
+        end = _param_int(params, "end", start + max_batch)
+        if end <= start:
+            raise ValueError("end must be greater than start")
+        return ("range", start, min(end, start + max_batch))
+
+    if "sample" in params:
+        count = min(max(1, _param_int(params, "sample")), max_batch)
+        return ("sample", count, _param_int(params, "seed"))
+
+    raise ValueError("Specify label, start/end or sample")
+
+
+class ActivationQuery:
+    """Label, index-range and random-sample queries over one MNIST split.
+
+    Uses a private model copy, since the engine's carries the stream's
+    capture hooks; encoded results are kept in a small LRU.
+    """
+
+    def __init__(
+        self,
+        model: nn.Module,
+        data_dir: str = "./data/mnist",
+        train: bool = True,
+        device: str = "cpu",
+        max_batch: int = 1024,
+        cache_size: int = 32,
+        quantize: bool = False
+    ):
+        self.device = device
+        self.max_batch = max_batch
+        self.cache_size = cache_size
+
+        self.model = RhizomeAutoencoder().to(device)
+        self.model.load_state_dict(model.state_dict())
+        self.model.eval()
+        if quantize:
+            self.model = quantize_dynamic_int8(self.model)
+        self.capture = ActivationCapture(self.model, flat=True, max_batch=max_batch)
+        self.layer_order = self.capture.layer_order
+        self.layer_sizes = self.capture.layer_sizes
+
+        self.dataset = TensorMNIST(data_dir, train=train, shuffle=False, device=device)
+        labels = self.dataset.labels.cpu().numpy()
+        self.labels = labels.astype(np.uint8)
+        # Stable sort keeps each label's indices in dataset order.
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(NUM_LABELS + 1))
+        self.label_index: Dict[int, np.ndarray] = {
+            label: order[bounds[label]:bounds[label + 1]]
+            for label in range(NUM_LABELS)
+        }
+
+        self.results: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self.dataset.num_samples
+
+    def select(self, query: Tuple) -> np.ndarray:
+        kind = query[0]
+        if kind == "label":
+            _, label, offset, limit = query
+            return self.label_index[label][offset:offset + limit]
+        if kind == "range":
+            _, start, end = query
+            return np.arange(min(start, len(self)), min(end, len(self)))
+        _, count, seed = query
+        rng = np.random.default_rng(seed)
+        return np.sort(rng.choice(len(self), size=min(count, len(self)), replace=False))
+
+    def run(self, query: Tuple, fmt: str = "f16") -> Tuple[bytes, bool]:
+        """(encoded activations, cache hit) for `query` in resolved format `fmt`."""
+        key = query + (fmt,)
+        cacheable = query[0] != "sample" or query[2] is not None
+
+        with self.lock:
+            if cacheable and key in self.results:
+                self.results.move_to_end(key)
+                self.hits += 1
+                return self.results[key], True
+            self.misses += 1
+
+            indices = self.select(query)
+            values = self._forward(indices)
+
+        message = self._encode(indices, values, fmt)
+
+        if cacheable:
+            with self.lock:
+                self.results[key] = message
+                while len(self.results) > self.cache_size:
+                    self.results.popitem(last=False)
+        return message, False
+
+    def activations(self, query: Tuple) -> Tuple[np.ndarray, np.ndarray]:
+        """(labels, values) for `query`, bypassing the cache."""
+        with self.lock:
+            indices = self.select(query)
+            return self.labels[indices], self._forward(indices)
+
+    def _forward(self, indices: np.ndarray) -> np.ndarray:
+        if len(indices) == 0:
+            return np.empty((0, sum(self.layer_sizes)), dtype=np.float32)
+
+        images, _ = self.dataset.batch(torch.from_numpy(indices).to(self.dataset.images.device))
+        with torch.inference_mode():
+            self.model(images)
+        # Copy: the capture buffer is reused by the next query.
+        return self.capture.get_flat_host(normalize=True).copy()
+
+    def _encode(self, indices: np.ndarray, values: np.ndarray, fmt: str) -> bytes:
+        labels = self.labels[indices]
+        if fmt != "json":
+            return encode_activation_batch(values, self.layer_sizes, indices, labels, dtype=fmt)
+
+        bounds = np.cumsum([0] + self.layer_sizes)
+        return serialize_to_json({
+            "type": "activation_batch",
+            "indices": indices,
+            "labels": labels,
+            "layers": {
+                name: np.ascontiguousarray(values[:, start:end])
+                for name, start, end in zip(self.layer_order, bounds, bounds[1:])
+            }
+        })
+
+    def memory_bytes(self) -> int:
+        total = model_bytes(self.model)
+        total += self.capture.buffer.numel() * self.capture.buffer.element_size()
+        total += sum(len(message) for message in self.results.values())
+        if self.dataset.images.device.type != "cpu":
+            total += self.dataset.images.numel() * self.dataset.images.element_size()
+        return total
+
+    def close(self):
+        self.capture.remove_hooks()
+
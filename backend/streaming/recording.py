@@ -0,0 +1,342 @@
+"""Append-only session recordings and their replay over /ws."""
+
+import asyncio
+import os
+import threading
+import time
+import numpy as np
+import orjson
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional
+
+from streaming.cache import get_cache_dir, write_atomic
+from streaming.compression import CodecRegistry, CompressedMessages
+from streaming.frames import ActivationFrame
+from streaming.lod import LevelsOfDetail
+from streaming.serializer import serialize_to_json
+from streaming.topology import ProgressiveTopology
+
+
+RECORDING_VERSION = 1
+
+META_FILE = "meta.json"
+TOPOLOGY_FILE = "topology.json"
+
+ACTIVATION_DTYPE = np.dtype("<f2")
+# Per-frame columns stored next to the per-layer activation columns.
+FRAME_COLUMNS = {
+    "labels": np.dtype("u1"),
+    "timestamps": np.dtype("<f8"),
+    "frames": np.dtype("<i8"),
+}
+
+# Gaps longer than this (the stream had no viewers, or the server restarted
+# mid-recording) are shortened on replay.
+MAX_REPLAY_GAP = 0.5
+
+
+def get_recording_dir() -> Path:
+    return Path(os.getenv("RHIZOME_RECORDING_DIR", str(get_cache_dir() / "recordings")))
+
+
+def _column_path(directory: Path, name: str, dtype: np.dtype) -> Path:
+    return directory / f"{name}.{dtype.kind}{dtype.itemsize}"
+
+
+def read_recording_meta(directory: Path) -> Optional[dict]:
+    try:
+        return orjson.loads((Path(directory) / META_FILE).read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def resolve_recording(name: str) -> Path:
+    """Map a client-supplied recording name to a directory under the recording dir."""
+    root = get_recording_dir().resolve()
+    candidate = (root / name).resolve()
+    if candidate.parent != root or read_recording_meta(candidate) is None:
+        raise ValueError(f"Unknown recording: {name}")
+    return candidate
+
+
+def list_recordings() -> List[str]:
+    root = get_recording_dir()
+    if not root.exists():
+        return []
+    return sorted(path.name for path in root.iterdir() if (path / META_FILE).exists())
+
+
+class SessionRecorder:
+    """Appends streamed frames to a recording directory, one raw column file per field."""
+
+    def __init__(
+        self,
+        directory: Path,
+        topology_message: bytes,
+        layer_order: List[str],
+        layer_sizes: List[int],
+        checkpoint: str = "",
+        flush_every: int = 30
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        meta = read_recording_meta(self.directory)
+        if meta is None:
+            write_atomic(self.directory / TOPOLOGY_FILE, topology_message)
+            write_atomic(self.directory / META_FILE, serialize_to_json({
+                "version": RECORDING_VERSION,
+                "checkpoint": checkpoint,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "layer_order": list(layer_order),
+                "layer_sizes": list(layer_sizes)
+            }))
+        elif meta.get("version") != RECORDING_VERSION or meta["layer_sizes"] != list(layer_sizes):
+            raise ValueError(f"Recording at {self.directory} has a different layout")
+
+        self.bounds = np.cumsum([0] + list(layer_sizes)).tolist()
+        self.layer_files: List[BinaryIO] = [
+            open(_column_path(self.directory, name, ACTIVATION_DTYPE), "ab")
+            for name in layer_order
+        ]
+        self.column_files: Dict[str, BinaryIO] = {
+            name: open(_column_path(self.directory, name, dtype), "ab")
+            for name, dtype in FRAME_COLUMNS.items()
+        }
+        self.flush_every = flush_every
+        self.pending = 0
+        self.frames_written = 0
+        self.lock = threading.Lock()
+
+    def append(self, frame: ActivationFrame):
+        values = frame.values.astype(ACTIVATION_DTYPE, copy=False)
+        with self.lock:
+            if self.layer_files is None:
+                return
+            for f, start, end in zip(self.layer_files, self.bounds, self.bounds[1:]):
+                f.write(values[start:end].tobytes())
+            columns = self.column_files
+            columns["labels"].write(np.array(frame.label, FRAME_COLUMNS["labels"]).tobytes())
+            columns["timestamps"].write(np.array(frame.timestamp, FRAME_COLUMNS["timestamps"]).tobytes())
+            columns["frames"].write(np.array(frame.frame, FRAME_COLUMNS["frames"]).tobytes())
+
+            self.frames_written += 1
+            self.pending += 1
+            if self.pending >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        for f in self.layer_files + list(self.column_files.values()):
+            f.flush()
+        self.pending = 0
+
+    def close(self):
+        with self.lock:
+            if self.layer_files is None:
+                return
+            self._flush()
+            for f in self.layer_files + list(self.column_files.values()):
+                f.close()
+            self.layer_files = None
+        print(f"✓ Recorded {self.frames_written} frames to {self.directory}")
+
+
+class Recording:
+    """Read side of a recording: every column memory-mapped, one row per frame.
+
+    Mappings are read-only, so all viewers of a recording share the page
+    cache. `refresh` re-maps to pick up frames appended since opening.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.meta = read_recording_meta(self.directory)
+        if self.meta is None:
+            raise FileNotFoundError(f"No recording at {self.directory}")
+
+        self.name = self.directory.name
+        self.layer_order = self.meta["layer_order"]
+        self.layer_sizes = self.meta["layer_sizes"]
+        self.topology_message = (self.directory / TOPOLOGY_FILE).read_bytes()
+        self._progressive: Optional[ProgressiveTopology] = None
+        self.lod = LevelsOfDetail(self.topology_message, int(os.getenv("RHIZOME_LOD_LEVELS", "8")))
+        self.compressed_topology = CompressedMessages([self.topology_message])
+        self.codecs = CodecRegistry(
+            lambda fmt, count: [self.frame(i).encode(fmt) for i in range(min(len(self), count))]
+        )
+        self.lock = threading.Lock()
+        self.rows = 0
+        self.refresh()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _map(self, name: str, dtype: np.dtype, width: Optional[int] = None) -> np.ndarray:
+        """Map a column; `width` makes it a (rows, width) matrix instead of a vector."""
+        path = _column_path(self.directory, name, dtype)
+        rows = path.stat().st_size // (dtype.itemsize * (width or 1)) if path.exists() else 0
+        shape = (rows, width) if width is not None else (rows,)
+        if rows == 0:
+            # np.memmap can't map an empty file.
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+    def refresh(self) -> int:
+        with self.lock:
+            layers = [
+                self._map(name, ACTIVATION_DTYPE, size)
+                for name, size in zip(self.layer_order, self.layer_sizes)
+            ]
+            columns = {name: self._map(name, dtype) for name, dtype in FRAME_COLUMNS.items()}
+            self.layers, self.columns = layers, columns
+            self.rows = min(len(column) for column in layers + list(columns.values()))
+        return self.rows
+
+    def frame(self, index: int) -> ActivationFrame:
+        """Frame `index` of the recording, numbered by its position in the recording."""
+        values = np.concatenate([layer[index] for layer in self.layers]).astype(np.float32)
+        return ActivationFrame(
+            values,
+            self.layer_sizes,
+            frame=index,
+            label=int(self.columns["labels"][index]),
+            timestamp=float(self.columns["timestamps"][index])
+        )
+
+    def delay_after(self, index: int) -> float:
+        """Recorded time between frame `index` and the next one."""
+        timestamps = self.columns["timestamps"]
+        if index + 1 >= len(timestamps):
+            return 0.0
+        return min(max(float(timestamps[index + 1] - timestamps[index]), 0.0), MAX_REPLAY_GAP)
+
+    def get_topology_messages(self, codec=None, progressive: bool = False) -> List[bytes]:
+        """Same contract as `StreamingEngine.get_topology_messages`."""
+        if progressive:
+            if self._progressive is None:
+                self._progressive = ProgressiveTopology(self.topology_message)
+            return self._progressive.messages(codec)
+        return self.compressed_topology.get(codec)
+
+    def get_codec(self, name: str, fmt: str, use_dictionary: bool = True):
+        """Same contract as `StreamingEngine.get_codec`, sampling recorded frames."""
+        return self.codecs.get(name, fmt, use_dictionary)
+
+
+@lru_cache(maxsize=16)
+def _open_recording(directory: str) -> Recording:
+    return Recording(Path(directory))
+
+
+def open_recording(name: str) -> Recording:
+    """The shared reader for recording `name`; raises ValueError if unknown."""
+    return _open_recording(str(resolve_recording(name)))
+
+
+class ReplayCursor:
+    """Playback position and speed, changed by client control messages."""
+
+    MIN_SPEED = 0.05
+    MAX_SPEED = 64.0
+
+    def __init__(self, position: int = 0, speed: float = 1.0):
+        self.position = max(0, position)
+        self.speed = self.clamp_speed(speed)
+        self.seeked = False
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, str]) -> "ReplayCursor":
+        """Cursor for the `?seek=` frame and `?speed=` multiplier of a /ws replay."""
+        try:
+            position = int(params.get("seek", "0"))
+        except ValueError:
+            position = 0
+        try:
+            speed = float(params.get("speed", "1"))
+        except ValueError:
+            speed = 1.0
+        return cls(position, speed)
+
+    @classmethod
+    def clamp_speed(cls, speed: float) -> float:
+        return min(max(speed, cls.MIN_SPEED), cls.MAX_SPEED)
+
+    def apply(self, command: Dict[str, Any]):
+        if command.get("type") == "seek":
+            self.position = max(0, int(command["frame"]))
+            self.seeked = True
+        elif command.get("type") == "speed":
+            self.speed = self.clamp_speed(float(command["value"]))
+
+
+async def _receive_controls(websocket, cursor: ReplayCursor):
+    """Apply `{"type": "seek", "frame": n}` / `{"type": "speed", "value": x}` messages."""
+    while True:
+        text = await websocket.receive_text()
+        try:
+            cursor.apply(orjson.loads(text))
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+            print(f"Ignoring replay control message: {text[:80]}")
+
+
+def _replay_message(recording: Recording, encoder, index: int):
+    return encoder.encode(recording.frame(index)), recording.delay_after(index)
+
+
+async def replay_recording(
+    websocket,
+    recording: Recording,
+    encoder,
+    cursor: ReplayCursor,
+    loop: bool = True,
+    client: str = "",
+    preamble=None
+):
+    """Send recorded frames with their recorded spacing, scaled by `cursor.speed`.
+
+    No model runs: each frame is a row read from the mapped columns and
+    encoded off the event loop. Frames appended while replaying (a live
+    recording) are picked up at the end; with `loop` playback then wraps
+    to the first frame.
+    """
+    preamble = list(preamble or ())
+    receiver = asyncio.create_task(_receive_controls(websocket, cursor))
+    deadline = time.monotonic()
+    sent = 0
+    print(f"Replaying {recording.name} for {client} from frame {cursor.position} at {cursor.speed}x")
+
+    try:
+        while not receiver.done():
+            index = cursor.position
+            if index >= len(recording):
+                await asyncio.to_thread(recording.refresh)
+                if index >= len(recording):
+                    if not loop or not len(recording):
+                        break
+                    cursor.position = index = 0
+
+            cursor.seeked = False
+            message, delay = await asyncio.to_thread(_replay_message, recording, encoder, index)
+            if preamble:
+                await websocket.send_bytes(preamble.pop(0))
+            await websocket.send_bytes(message)
+            sent += 1
+
+            if cursor.seeked:
+                # A seek arrived while this frame was in flight; play from there now.
+                deadline = time.monotonic()
+                continue
+            cursor.position = index + 1
+
+            deadline += delay / cursor.speed
+            now = time.monotonic()
+            if deadline < now:
+                deadline = now
+            await asyncio.sleep(deadline - now)
+    finally:
+        receiver.cancel()
+        if receiver.done() and not receiver.cancelled():
+            receiver.exception()  # the client went away; nothing to report
+        print(f"Replay of {recording.name} for {client} ended after {sent} frames")
+
@@ -0,0 +1,128 @@
+"""Frame pacing on the monotonic clock, with per-client backpressure."""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+
+class FrameScheduler:
+    """Paces a loop against absolute deadlines so sleep jitter never accumulates.
+
+    Each tick's deadline is the previous deadline plus one interval rather
+    than "now + interval". When the loop falls more than one interval behind
+    it skips ahead instead of bursting to catch up, and counts the miss.
+    """
+
+    def __init__(self, fps: float):
+        self.interval = 1.0 / fps
+        self.start = time.monotonic()
+        self.next_deadline = self.start + self.interval
+        self.missed = 0
+
+    def set_fps(self, fps: float):
+        self.interval = 1.0 / fps
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    def _advance(self) -> float:
+        """Move to the next deadline and return how long to sleep until the current one."""
+        now = time.monotonic()
+        delay = self.next_deadline - now
+
+        if delay <= 0 and -delay > self.interval:
+            self.missed += 1
+            self.next_deadline = now
+
+        self.next_deadline += self.interval
+        return delay
+
+    async def wait(self):
+        delay = self._advance()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def sleep(self):
+        """Blocking `wait` for loops that run on their own thread."""
+        delay = self._advance()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ClientPacer:
+    """Tracks one client's send latency and queue depth and adapts its FPS.
+
+    The rate drops multiplicatively when a send takes most of a frame
+    interval or frames pile up in the client's queue, and climbs back one
+    FPS at a time toward `target_fps` after a run of healthy frames.
+    """
+
+    def __init__(
+        self,
+        target_fps: float,
+        min_fps: float = 2.0,
+        backoff: float = 0.75,
+        recover_after: int = 15
+    ):
+        self.target_fps = target_fps
+        self.min_fps = min(min_fps, target_fps)
+        self.backoff = backoff
+        self.recover_after = recover_after
+
+        self.fps = float(target_fps)
+        self.scheduler = FrameScheduler(self.fps)
+        self.healthy_frames = 0
+
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.send_latency = 0.0
+        self.achieved_fps = 0.0
+        self._last_send = None
+
+    @property
+    def throttled(self) -> bool:
+        return self.fps < self.target_fps
+
+    def record_send(self, latency: float, size: int, queue_depth: int):
+        now = time.monotonic()
+        if self._last_send is not None:
+            instant_fps = 1.0 / max(now - self._last_send, 1e-6)
+            self.achieved_fps += 0.1 * (instant_fps - self.achieved_fps)
+        self._last_send = now
+
+        self.frames_sent += 1
+        self.bytes_sent += size
+        self.send_latency += 0.2 * (latency - self.send_latency)
+
+        interval = 1.0 / self.fps
+        if latency > 0.75 * interval or queue_depth > 1:
+            self.fps = max(self.min_fps, self.fps * self.backoff)
+            self.healthy_frames = 0
+        elif latency < 0.25 * interval and queue_depth == 0:
+            self.healthy_frames += 1
+            if self.healthy_frames >= self.recover_after and self.throttled:
+                self.fps = min(self.target_fps, self.fps + 1.0)
+                self.healthy_frames = 0
+
+        self.scheduler.set_fps(self.fps)
+
+    async def wait(self):
+        """Hold the client to its own (possibly reduced) rate.
+
+        At full rate the broadcast already paces delivery, so there is
+        nothing to wait for.
+        """
+        if self.throttled:
+            await self.scheduler.wait()
+        else:
+            self.scheduler.next_deadline = time.monotonic() + self.scheduler.interval
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "target_fps": self.target_fps,
+            "effective_fps": round(self.fps, 2),
+            "achieved_fps": round(self.achieved_fps, 2),
+            "send_latency_ms": round(self.send_latency * 1000, 3),
+            "frames_sent": self.frames_sent,
+            "bytes_sent": self.bytes_sent,
+        }
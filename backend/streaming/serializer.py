@@ -1,16 +1,52 @@
 """Serialization helpers for WebSocket streaming."""
 
+import struct
 import orjson
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, List
 import torch
 import torch.nn as nn
 
 
-def serialize_topology(model: nn.Module) -> Dict[str, Any]:
+FRAME_MAGIC = b"RZAF"
+FRAME_VERSION = 1
+
+# Wire format name -> (header dtype code, numpy dtype)
+FRAME_DTYPES = {
+    "f16": (0, np.float16),
+    "u8": (1, np.uint8),
+}
+
+FRAME_KEY = 0
+FRAME_DELTA = 1
+
+BATCH_MAGIC = b"RZAB"
+BATCH_VERSION = 1
+
+# magic, version, dtype code, layer count, frame, label, kind, padding, timestamp
+_FRAME_HEADER = struct.Struct("<4sBBHIhBxd")
+_DELTA_COUNT = struct.Struct("<I")
+# magic, version, dtype code, layer count, sample count
+_BATCH_HEADER = struct.Struct("<4sBBHI")
+
+
+def _top_k_mask(strength: np.ndarray, k: int) -> np.ndarray:
+    """Mark the `k` largest entries of each row of `strength` (zeros never count)."""
+    k = min(k, strength.shape[1])
+    mask = np.zeros(strength.shape, dtype=bool)
+    if k == 0:
+        return mask
+    top = np.argpartition(-strength, k - 1, axis=1)[:, :k]
+    np.put_along_axis(mask, top, True, axis=1)
+    return mask & (strength > 0)
+
+
+def serialize_topology(model: nn.Module, threshold: float = 0.1, top_k: int = 4) -> Dict[str, Any]:
+    """Describe the network's nodes and strongest connections."""
     nodes = []
-    connections = []
+    node_offsets: Dict[str, int] = {}
+    layer_weights: Dict[str, np.ndarray] = {}
     node_id = 0
-    layer_info: Dict[str, Dict[str, Any]] = {}
 
     linear_layers = [
         (layer_name, module)
@@ -19,37 +55,50 @@ def serialize_topology(model: nn.Module) -> Dict[str, Any]:
     ]
 
     for layer_name, module in linear_layers:
-        layer_nodes = []
+        node_offsets[layer_name] = node_id
         for i in range(module.out_features):
             nodes.append({
                 "id": f"node_{node_id}",
                 "layer": layer_name,
                 "index": i
             })
-            layer_nodes.append(node_id)
             node_id += 1
 
-        layer_info[layer_name] = {
-            "nodes": layer_nodes,
-            "weights": module.weight.detach().cpu().numpy().tolist()
-        }
+        layer_weights[layer_name] = module.weight.detach().float().cpu().numpy()
 
     layer_names = sorted(name for name, _ in linear_layers)
 
+    # [coarse, fine] lists of per-layer-pair arrays
+    sources = ([np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)])
+    targets = ([np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)])
+    weights = ([np.empty(0, dtype=np.float32)], [np.empty(0, dtype=np.float32)])
+
     for source_layer, target_layer in zip(layer_names, layer_names[1:]):
-        source_nodes = layer_info[source_layer]["nodes"]
-        target_nodes = layer_info[target_layer]["nodes"]
-        weights = layer_info[target_layer]["weights"]
-
-        for target_idx, target_node in enumerate(target_nodes):
-            for source_idx, source_node in enumerate(source_nodes):
-                weight = weights[target_idx][source_idx]
-                if abs(weight) > 0.1:
-                    connections.append({
-                        "source": f"node_{source_node}",
-                        "target": f"node_{target_node}",
-                        "weight": float(weight)
-                    })
+        layer_weight = layer_weights[target_layer]
+        mask = np.abs(layer_weight) > threshold
+        strength = np.where(mask, np.abs(layer_weight), 0.0)
+
+        # Rows are target nodes (incoming), columns are source nodes (outgoing).
+        coarse = _top_k_mask(strength, top_k) | _top_k_mask(strength.T, top_k).T
+
+        for level, level_mask in enumerate((coarse, mask & ~coarse)):
+            target_idx, source_idx = np.nonzero(level_mask)
+            sources[level].append(source_idx + node_offsets[source_layer])
+            targets[level].append(target_idx + node_offsets[target_layer])
+            weights[level].append(layer_weight[target_idx, source_idx])
+
+    coarse_weight = np.concatenate(weights[0])
+    fine_weight = np.concatenate(weights[1])
+    fine_order = np.argsort(-np.abs(fine_weight), kind="stable")
+
+    # Columnar source/target/weight arrays: the coarse level (each node's
+    # top_k strongest links, ending at metadata["lod"]["coarse_connections"])
+    # first, then the rest by descending |weight|, so any prefix is usable.
+    connections = {
+        "source": np.concatenate([np.concatenate(sources[0]), np.concatenate(sources[1])[fine_order]]).astype(np.int32),
+        "target": np.concatenate([np.concatenate(targets[0]), np.concatenate(targets[1])[fine_order]]).astype(np.int32),
+        "weight": np.concatenate([coarse_weight, fine_weight[fine_order]])
+    }
 
     topology = {
         "type": "topology",
@@ -57,8 +106,15 @@ def serialize_topology(model: nn.Module) -> Dict[str, Any]:
         "connections": connections,
         "metadata": {
             "total_nodes": len(nodes),
-            "total_connections": len(connections),
-            "layers": len(layer_names)
+            "total_connections": len(connections["weight"]),
+            "threshold": threshold,
+            "layers": len(layer_names),
+            "layer_order": [name for name, _ in linear_layers],
+            "layer_sizes": [module.out_features for _, module in linear_layers],
+            "lod": {
+                "top_k": top_k,
+                "coarse_connections": len(coarse_weight)
+            }
         }
     }
 
@@ -90,5 +146,113 @@ def serialize_activations(activations: Dict[str, torch.Tensor], timestamp: float
     return activation_frame
 
 
+def quantize_values(values: np.ndarray, dtype: str = "f16") -> np.ndarray:
+    _, np_dtype = FRAME_DTYPES[dtype]
+    if np_dtype is np.uint8:
+        return np.rint(np.clip(values, 0.0, 1.0) * 255.0).astype(np.uint8)
+    return values.astype(np_dtype)
+
+
+def dequantize_values(payload: np.ndarray) -> np.ndarray:
+    if payload.dtype == np.uint8:
+        return payload.astype(np.float32) / 255.0
+    return payload.astype(np.float32)
+
+
+def encode_activation_frame(
+    values: np.ndarray,
+    layer_sizes: List[int],
+    frame: int,
+    label: int,
+    timestamp: float,
+    dtype: str = "f16"
+) -> bytes:
+    """Pack a flat activation vector into a versioned binary frame.
+
+    Layout (little endian): 24-byte header, one uint32 node count per layer,
+    then every layer's values back to back in topology node order.
+    """
+    code, _ = FRAME_DTYPES[dtype]
+    payload = quantize_values(values, dtype)
+
+    header = _FRAME_HEADER.pack(
+        FRAME_MAGIC,
+        FRAME_VERSION,
+        code,
+        len(layer_sizes),
+        frame,
+        label,
+        FRAME_KEY,
+        timestamp
+    )
+    sizes = np.asarray(layer_sizes, dtype="<u4")
+
+    return b"".join((header, sizes.tobytes(), payload.tobytes()))
+
+
+def encode_delta_frame(
+    indices: np.ndarray,
+    values: np.ndarray,
+    frame: int,
+    label: int,
+    timestamp: float,
+    dtype: str = "f16"
+) -> bytes:
+    """Pack the nodes that changed since the client's last frame.
+
+    Layout: the keyframe header with kind=1 and a layer count of 0, a uint32
+    change count, uint16 node indices, then the new values in `dtype`.
+    """
+    code, _ = FRAME_DTYPES[dtype]
+
+    header = _FRAME_HEADER.pack(
+        FRAME_MAGIC,
+        FRAME_VERSION,
+        code,
+        0,
+        frame,
+        label,
+        FRAME_DELTA,
+        timestamp
+    )
+
+    return b"".join((
+        header,
+        _DELTA_COUNT.pack(len(indices)),
+        indices.astype("<u2").tobytes(),
+        quantize_values(values, dtype).tobytes()
+    ))
+
+
+def encode_activation_batch(
+    values: np.ndarray,
+    layer_sizes: List[int],
+    indices: np.ndarray,
+    labels: np.ndarray,
+    dtype: str = "f16"
+) -> bytes:
+    """Pack a [samples, total_nodes] activation batch layer by layer.
+
+    Layout (little endian): 12-byte header, one uint32 node count per layer,
+    uint32 dataset indices, uint8 labels, then each layer as one contiguous
+    [samples, nodes] block, so a layer is a single reshape on the client.
+    """
+    code, _ = FRAME_DTYPES[dtype]
+    payload = quantize_values(values, dtype)
+    bounds = np.cumsum([0] + list(layer_sizes))
+
+    parts = [
+        _BATCH_HEADER.pack(BATCH_MAGIC, BATCH_VERSION, code, len(layer_sizes), len(indices)),
+        np.asarray(layer_sizes, dtype="<u4").tobytes(),
+        np.asarray(indices, dtype="<u4").tobytes(),
+        np.asarray(labels, dtype=np.uint8).tobytes(),
+    ]
+    parts.extend(
+        np.ascontiguousarray(payload[:, start:end]).tobytes()
+        for start, end in zip(bounds, bounds[1:])
+    )
+    return b"".join(parts)
+
+
 def serialize_to_json(data: Dict[str, Any]) -> bytes:
-    return orjson.dumps(data)
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
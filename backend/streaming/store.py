@@ -0,0 +1,183 @@
+"""Precomputed, memory-mapped activations for inference-free streaming."""
+
+import os
+import shutil
+import time
+import numpy as np
+import orjson
+import torch
+import torch.nn as nn
+from pathlib import Path
+from typing import Optional, Tuple
+
+from network.hooks import ActivationCapture
+from data.loader import TensorMNIST
+from streaming.cache import checkpoint_fingerprint, get_cache_dir, write_atomic
+from streaming.serializer import serialize_to_json
+
+
+STORE_VERSION = 1
+
+ACTIVATIONS_FILE = "activations.npy"
+LABELS_FILE = "labels.npy"
+META_FILE = "meta.json"
+
+
+def get_store_dir() -> Path:
+    return Path(os.getenv("RHIZOME_STORE_DIR", str(get_cache_dir() / "activations")))
+
+
+def store_dir_for(checkpoint_path) -> Path:
+    """Store directory for one checkpoint; every checkpoint's store is a sibling."""
+    return get_store_dir() / Path(checkpoint_path).stem
+
+
+def read_store_meta(store_dir: Path) -> Optional[dict]:
+    try:
+        return orjson.loads((Path(store_dir) / META_FILE).read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def is_store_current(store_dir: Path, checkpoint_path) -> bool:
+    meta = read_store_meta(store_dir)
+    fingerprint = checkpoint_fingerprint(checkpoint_path)
+    return (
+        meta is not None
+        and fingerprint is not None
+        and meta.get("version") == STORE_VERSION
+        and meta.get("checkpoint") == fingerprint
+    )
+
+
+def build_activation_store(
+    model: nn.Module,
+    checkpoint_path,
+    store_dir: Optional[Path] = None,
+    data_dir: str = "./data/mnist",
+    batch_size: int = 1024,
+    device: str = "cpu"
+) -> Path:
+    """Run the MNIST training split through `model` and persist its activations.
+
+    Rows are normalized exactly like the live stream and stored as float16
+    in topology node order, next to a uint8 label column. `meta.json` is
+    written last and records the checkpoint fingerprint, so a half-written
+    store is never mistaken for a valid one.
+    """
+    store_dir = Path(store_dir) if store_dir is not None else store_dir_for(checkpoint_path)
+    fingerprint = checkpoint_fingerprint(checkpoint_path)
+    if fingerprint is None:
+        raise FileNotFoundError(f"Checkpoint not found: {checkpoint_path}")
+
+    loader = TensorMNIST(data_dir, train=True, batch_size=batch_size, shuffle=False, device=device)
+    num_samples = loader.num_samples
+
+    model = model.to(device)
+    model.eval()
+    capture = ActivationCapture(model, flat=True, max_batch=batch_size, pin_memory=device == "cuda")
+    layer_order = capture.layer_order
+    layer_sizes = capture.layer_sizes
+    total_nodes = sum(layer_sizes)
+
+    tmp_dir = store_dir.with_name(f".{store_dir.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    activations = np.lib.format.open_memmap(
+        tmp_dir / ACTIVATIONS_FILE, mode="w+", dtype=np.float16, shape=(num_samples, total_nodes)
+    )
+    labels = np.lib.format.open_memmap(
+        tmp_dir / LABELS_FILE, mode="w+", dtype=np.uint8, shape=(num_samples,)
+    )
+
+    print(f"Building activation store ({num_samples} samples, {total_nodes} nodes)...")
+    start = time.time()
+    offset = 0
+
+    try:
+        with torch.no_grad():
+            for images, batch_labels in loader:
+                model(images)
+
+                end = offset + images.size(0)
+                activations[offset:end] = capture.get_flat_host(normalize=True)
+                labels[offset:end] = batch_labels.cpu().numpy()
+                offset = end
+    finally:
+        capture.remove_hooks()
+
+    activations.flush()
+    labels.flush()
+    del activations, labels
+
+    write_atomic(tmp_dir / META_FILE, serialize_to_json({
+        "version": STORE_VERSION,
+        "checkpoint": fingerprint,
+        "samples": offset,
+        "layer_order": layer_order,
+        "layer_sizes": layer_sizes
+    }))
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(tmp_dir, store_dir)
+
+    print(f"✓ Activation store written to {store_dir} in {time.time() - start:.1f}s")
+    return store_dir
+
+
+class ActivationStore:
+    """Serves frames by slicing the memory-mapped activation matrix.
+
+    The mapping is read-only, so every worker process on a host shares one
+    page-cached copy of the file.
+    """
+
+    def __init__(self, store_dir: Path, shuffle: bool = True):
+        store_dir = Path(store_dir)
+        self.meta = read_store_meta(store_dir)
+        if self.meta is None:
+            raise FileNotFoundError(f"No activation store at {store_dir}")
+
+        self.activations = np.load(store_dir / ACTIVATIONS_FILE, mmap_mode="r")
+        self.labels = np.load(store_dir / LABELS_FILE, mmap_mode="r")
+        self.layer_sizes = self.meta["layer_sizes"]
+        self.shuffle = shuffle
+        self.order = self._new_order()
+        self.position = 0
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def _new_order(self) -> np.ndarray:
+        if self.shuffle:
+            return np.random.permutation(len(self.labels))
+        return np.arange(len(self.labels))
+
+    def get(self, index: int) -> Tuple[np.ndarray, int]:
+        return self.activations[index].astype(np.float32), int(self.labels[index])
+
+    def next_frame(self) -> Tuple[np.ndarray, int]:
+        if self.position >= len(self.order):
+            self.order = self._new_order()
+            self.position = 0
+
+        index = self.order[self.position]
+        self.position += 1
+        return self.get(index)
+
+
+def open_activation_store(
+    model: nn.Module,
+    checkpoint_path,
+    store_dir: Optional[Path] = None,
+    **build_kwargs
+) -> ActivationStore:
+    """Open the store for `checkpoint_path`, rebuilding it if the checkpoint changed."""
+    store_dir = Path(store_dir) if store_dir is not None else store_dir_for(checkpoint_path)
+
+    if not is_store_current(store_dir, checkpoint_path):
+        print("Activation store missing or stale, rebuilding...")
+        build_activation_store(model, checkpoint_path, store_dir=store_dir, **build_kwargs)
+
+    return ActivationStore(store_dir)
@@ -0,0 +1,55 @@
+"""Progressive (level-of-detail) delivery of the topology message."""
+
+from typing import Dict, List
+
+import orjson
+
+from streaming.compression import CompressedMessages
+from streaming.serializer import serialize_to_json
+
+
+class ProgressiveTopology:
+    """Splits an encoded topology into a coarse message and fine chunks."""
+
+    def __init__(self, message: bytes, chunk_size: int = 10000):
+        topology = orjson.loads(message)
+        metadata = topology["metadata"]
+        connections = topology["connections"]
+        total = metadata["total_connections"]
+        coarse = metadata.get("lod", {}).get("coarse_connections", total)
+
+        # Connections are already coarse-first, so every level is a slice.
+        # Wire format: a regular `topology` message (all nodes, coarse
+        # connections, metadata["progressive"]), then `topology_chunk`
+        # messages carrying the next slice in the same columnar layout.
+        bounds = list(range(coarse, total, max(1, chunk_size))) + [total]
+        chunk_bounds = list(zip(bounds, bounds[1:]))
+
+        coarse_topology = dict(topology)
+        coarse_topology["connections"] = self._slice(connections, 0, coarse)
+        coarse_topology["metadata"] = dict(metadata, progressive={
+            "coarse_connections": coarse,
+            "chunks": len(chunk_bounds),
+            "chunk_size": chunk_size
+        })
+
+        self.coarse_message = serialize_to_json(coarse_topology)
+        self.chunk_messages: List[bytes] = [
+            serialize_to_json({
+                "type": "topology_chunk",
+                "index": index,
+                "count": len(chunk_bounds),
+                "offset": start,
+                "connections": self._slice(connections, start, end)
+            })
+            for index, (start, end) in enumerate(chunk_bounds)
+        ]
+        self._messages = CompressedMessages([self.coarse_message] + self.chunk_messages)
+
+    @staticmethod
+    def _slice(connections: Dict[str, list], start: int, end: int) -> Dict[str, list]:
+        return {key: column[start:end] for key, column in connections.items()}
+
+    def messages(self, codec=None) -> List[bytes]:
+        """Coarse message first, then the chunks; compressed once per codec."""
+        return self._messages.get(codec)
@@ -0,0 +1,151 @@
+"""
+Compare compression codecs for the activation stream: bytes on the wire vs CPU.
+
+Encodes real frames from the streaming engine in each wire format, trains
+dictionaries on the first half and measures the second half, and reports
+mean bytes per frame, compression ratio and compress/decompress time per
+frame for every codec. "permessage-deflate" models the WebSocket extension
+uvicorn negotiates with browsers by default (one deflate stream per
+connection with context takeover) for reference.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from streaming.compression import make_codec, train_dictionary, zstd_available
+from streaming.delta import DeltaEncoder
+from streaming.frames import FrameEncoder
+
+
+class PerMessageDeflate:
+    """One long-lived deflate stream, flushed per message, like RFC 7692 with context takeover."""
+
+    name = "permessage-deflate"
+
+    def __init__(self, level=6):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        self.decompressor = zlib.decompressobj(-15)
+
+    def compress(self, data):
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def decompress(self, data):
+        return self.decompressor.decompress(data)
+
+
+def codec_variants(train):
+    """(label, factory) pairs; factories so stateful codecs start fresh per run."""
+    variants = [
+        ("deflate", lambda: make_codec("deflate")),
+        ("deflate+dict", lambda: make_codec("deflate", train_dictionary("deflate", train))),
+        ("permessage-deflate", PerMessageDeflate),
+    ]
+    if zstd_available():
+        zstd_dict = train_dictionary("zstd", train)
+        variants += [
+            ("zstd", lambda: make_codec("zstd")),
+            ("zstd+dict", lambda: make_codec("zstd", zstd_dict)),
+        ]
+    return variants
+
+
+def measure(codec, messages):
+    sizes, compress_ns, decompress_ns = [], [], []
+    for message in messages:
+        start = time.perf_counter_ns()
+        compressed = codec.compress(message)
+        compress_ns.append(time.perf_counter_ns() - start)
+
+        start = time.perf_counter_ns()
+        restored = codec.decompress(compressed)
+        decompress_ns.append(time.perf_counter_ns() - start)
+
+        if restored != message:
+            raise RuntimeError(f"{codec.name} round trip mismatch")
+        sizes.append(len(compressed))
+
+    raw = sum(len(message) for message in messages)
+    return {
+        "bytes_per_frame": round(float(np.mean(sizes)), 1),
+        "ratio": round(raw / max(sum(sizes), 1), 3),
+        "compress_us_p50": round(float(np.percentile(compress_ns, 50)) / 1e3, 2),
+        "compress_us_p95": round(float(np.percentile(compress_ns, 95)) / 1e3, 2),
+        "decompress_us_p50": round(float(np.percentile(decompress_ns, 50)) / 1e3, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--checkpoint', default=os.getenv(
+        'RHIZOME_CHECKPOINT_PATH', './backend/checkpoints/rhizome_autoencoder_latest.pth'))
+    parser.add_argument('--data-dir', default=os.getenv('RHIZOME_DATA_DIR', './data/mnist'))
+    parser.add_argument('--frames', type=int, default=600, help='frames per format (half train, half measure)')
+    parser.add_argument('--formats', default='json,f16,u8,f16+delta')
+    parser.add_argument('--output', default='bench_codecs.json')
+    args = parser.parse_args()
+
+    from streaming.engine import StreamingEngine
+
+    engine = StreamingEngine(checkpoint_path=args.checkpoint, device='cpu', data_dir=args.data_dir)
+    engine.warmup()
+    frames = [engine.produce_frame(i, i / 30) for i in range(args.frames)]
+    topology = engine.get_topology_message()
+    engine.stop()
+
+    results = {"frames": args.frames, "zstd_available": zstd_available(), "formats": {}, "topology": {}}
+
+    for label in args.formats.split(','):
+        fmt, _, encoding = label.partition('+')
+        encoder = DeltaEncoder(dtype=fmt) if encoding == 'delta' else FrameEncoder(fmt)
+        messages = [encoder.encode(frame) for frame in frames]
+        half = len(messages) // 2
+        train, test = messages[:half], messages[half:]
+
+        rows = {"none": {
+            "bytes_per_frame": round(float(np.mean([len(m) for m in test])), 1),
+            "ratio": 1.0,
+            "compress_us_p50": 0.0,
+            "compress_us_p95": 0.0,
+            "decompress_us_p50": 0.0,
+        }}
+        for name, factory in codec_variants(train):
+            rows[name] = measure(factory(), test)
+        results["formats"][label] = rows
+
+    # The topology is sent once per connection, so only plain codecs matter.
+    for name, factory in codec_variants([]):
+        if name not in ("deflate", "zstd"):
+            continue
+        codec = factory()
+        start = time.perf_counter()
+        compressed = codec.compress(topology)
+        results["topology"][name] = {
+            "bytes": len(compressed),
+            "ratio": round(len(topology) / len(compressed), 2),
+            "compress_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+    results["topology"]["none"] = {"bytes": len(topology), "ratio": 1.0, "compress_ms": 0.0}
+
+    print(f"{'format':<12} {'codec':<20} {'bytes/frame':>12} {'ratio':>7} {'comp us':>9} {'decomp us':>10}")
+    for label, rows in results["formats"].items():
+        for name, row in rows.items():
+            print(f"{label:<12} {name:<20} {row['bytes_per_frame']:>12.1f} {row['ratio']:>7.2f} "
+                  f"{row['compress_us_p50']:>9.1f} {row['decompress_us_p50']:>10.1f}")
+    for name, row in results["topology"].items():
+        print(f"topology     {name:<20} {row['bytes']:>12} {row['ratio']:>7.2f} {row['compress_ms']:>8.1f}ms")
+
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
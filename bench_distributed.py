@@ -0,0 +1,115 @@
+"""
+Benchmark data-parallel CPU training throughput at several process counts.
+
+Each run spawns N gloo processes (see network.training.run_distributed),
+runs network.training.train_epoch on sharded MNIST for a fixed number of
+steps per process and reports global samples/sec and scaling efficiency
+against the single-process run.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+import torch
+import torch.distributed as dist
+import torch.nn as nn
+import torch.optim as optim
+from torch.nn.parallel import DistributedDataParallel
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from data.loader import TensorMNIST
+from network.model import RhizomeAutoencoder
+from network.training import run_distributed, train_epoch
+
+
+class StepLoader:
+    """The next `steps` batches of a sharded loader, cycling epochs; fed to `train_epoch`."""
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.steps = 0
+        self.batches = self._cycle()
+
+    def _cycle(self):
+        epoch = 0
+        while True:
+            self.loader.set_epoch(epoch)
+            yield from self.loader
+            epoch += 1
+
+    def take(self, steps):
+        self.steps = steps
+        return self
+
+    def __len__(self):
+        return self.steps
+
+    def __iter__(self):
+        return islice(self.batches, self.steps)
+
+
+def train_steps(batch_size, steps, warmup, data_dir):
+    """Runs in every rank; returns (seconds, samples) for `steps` of `train_epoch`."""
+    rank, world_size = dist.get_rank(), dist.get_world_size()
+    model = DistributedDataParallel(RhizomeAutoencoder())
+    optimizer = optim.Adam(model.parameters(), lr=0.001)
+    criterion = nn.MSELoss()
+    loader = StepLoader(TensorMNIST(data_dir, train=True, batch_size=batch_size, rank=rank, world_size=world_size))
+
+    train_epoch(model, loader.take(warmup), criterion, optimizer, 'cpu')
+
+    dist.barrier()
+    start = time.perf_counter()
+    train_epoch(model, loader.take(steps), criterion, optimizer, 'cpu')
+    dist.barrier()
+    return time.perf_counter() - start, steps * batch_size * world_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data-dir', default=os.getenv('RHIZOME_DATA_DIR', './data/mnist'))
+    parser.add_argument('--workers', default='1,2,4,8', help='comma-separated process counts')
+    parser.add_argument('--batch-size', type=int, default=64, help='per process')
+    parser.add_argument('--steps', type=int, default=200, help='timed steps per process')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--output', default='bench_distributed.json')
+    args = parser.parse_args()
+
+    results = {
+        "cpu_count": os.cpu_count(),
+        "torch": torch.__version__,
+        "batch_size": args.batch_size,
+        "steps": args.steps,
+        "runs": {},
+    }
+
+    print(f"{'workers':>8} {'samples/s':>12} {'speedup':>9} {'efficiency':>11}")
+    baseline = None
+    for workers in (int(n) for n in args.workers.split(',')):
+        seconds, samples = run_distributed(
+            train_steps, workers, args.batch_size, args.steps, args.warmup, args.data_dir)
+        samples_per_sec = samples / seconds
+        if workers == 1:
+            baseline = samples_per_sec
+        speedup = samples_per_sec / baseline if baseline else float('nan')
+
+        results["runs"][workers] = {
+            "samples_per_sec": round(samples_per_sec, 1),
+            "seconds": round(seconds, 3),
+            "speedup": round(speedup, 3),
+            "efficiency": round(speedup / workers, 3),
+        }
+        print(f"{workers:>8} {samples_per_sec:>12.0f} {speedup:>8.2f}x {speedup / workers:>10.0%}")
+
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Benchmark the streaming hot path on CPU.
+
+Times topology/activation serialization, capture normalization and a single
+forward pass, then runs the real stream_activations loop against an
+in-process WebSocket. Results are written as JSON; pass --compare with an
+earlier results file to flag regressions.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import torch
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from network.model import RhizomeAutoencoder
+from network.hooks import ActivationCapture
+from network.training import load_model_weights, weights_path_for
+from streaming.serializer import serialize_topology, serialize_activations, serialize_to_json
+
+# Metrics where a larger value is a regression.
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "alloc_kb_per_iter")
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def summarize(samples_ns):
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    return {
+        "iterations": len(samples),
+        "mean_ms": round(float(samples.mean()), 4),
+        "p50_ms": round(float(np.percentile(samples, 50)), 4),
+        "p95_ms": round(float(np.percentile(samples, 95)), 4),
+        "p99_ms": round(float(np.percentile(samples, 99)), 4),
+        "max_ms": round(float(samples.max()), 4),
+    }
+
+
+def measure_allocations(fn, iterations):
+    """Peak bytes allocated per call, measured in a separate traced pass.
+
+    Traced separately because tracemalloc slows every allocation; numpy
+    buffers are traced too, torch tensor storage is not.
+    """
+    tracemalloc.start()
+    try:
+        peak_total = 0
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - start
+    finally:
+        tracemalloc.stop()
+
+    return {"alloc_kb_per_iter": round(peak_total / iterations / 1024, 3)}
+
+
+def bench(fn, iterations, warmup=5, alloc_iterations=20):
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append(time.perf_counter_ns() - start)
+
+    result = summarize(samples)
+    result.update(measure_allocations(fn, min(alloc_iterations, iterations)))
+    return result
+
+
+def load_model(checkpoint):
+    model = RhizomeAutoencoder()
+    if checkpoint and (Path(checkpoint).exists() or weights_path_for(checkpoint).exists()):
+        load_model_weights(model, checkpoint, device='cpu')
+    return model.eval()
+
+
+def run_micro(model, iterations, batch_size):
+    results = {}
+    sample = torch.rand(1, 784)
+    batch = torch.rand(batch_size, 784)
+
+    results["serialize_topology"] = bench(
+        lambda: serialize_topology(model), max(5, iterations // 20), warmup=1, alloc_iterations=3)
+
+    with torch.no_grad():
+        results["forward_single"] = bench(lambda: model(sample), iterations)
+
+    capture = ActivationCapture(model)
+    with torch.no_grad():
+        model(sample)
+    activations = capture.get_activations(normalize=True)
+    results["capture_normalize"] = bench(lambda: capture.get_activations(normalize=True), iterations)
+
+    frame = serialize_activations(activations, timestamp=0.0)
+    results["serialize_activations"] = bench(
+        lambda: serialize_activations(activations, timestamp=0.0), iterations)
+    results["serialize_to_json"] = bench(lambda: serialize_to_json(frame), iterations)
+    capture.remove_hooks()
+
+    flat = ActivationCapture(model, flat=True, max_batch=batch_size)
+    with torch.no_grad():
+        model(batch)
+    results["capture_normalize_flat"] = bench(lambda: flat.get_flat(normalize=True), iterations)
+    results["capture_normalize_flat"]["batch_size"] = batch_size
+    flat.remove_hooks()
+
+    return results
+
+
+class BenchWebSocket:
+    """Stands in for a client: records send times and stops the engine after `frames`."""
+
+    def __init__(self, engine, frames):
+        self.engine = engine
+        self.frames = frames
+        self.sent = 0
+        self.bytes_sent = 0
+        self.latencies = []
+        self.allocated = 0
+        self.frame_start = None
+        self.traced_start = 0
+
+    def start_frame(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self.traced_start, _ = tracemalloc.get_traced_memory()
+        self.frame_start = time.perf_counter_ns()
+
+    async def send_bytes(self, data):
+        self.latencies.append(time.perf_counter_ns() - self.frame_start)
+        if tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            self.allocated += peak - self.traced_start
+        self.sent += 1
+        self.bytes_sent += len(data)
+        if self.sent >= self.frames:
+            self.engine.running = False
+
+
+def run_stream(args):
+    from streaming.engine import StreamingEngine
+    from streaming.frames import build_encoder
+
+    engine = StreamingEngine(
+        checkpoint_path=args.checkpoint,
+        device='cpu',
+        target_fps=args.fps,
+        data_dir=args.data_dir,
+        batch_size=args.batch_size
+    )
+    engine.warmup()
+    encoder = build_encoder({"format": args.format})
+
+    def run(frames):
+        websocket = BenchWebSocket(engine, frames)
+        produce = StreamingEngine.produce_frame.__get__(engine)
+
+        def timed_produce(frame_count, timestamp):
+            websocket.start_frame()
+            return produce(frame_count, timestamp)
+
+        engine.produce_frame = timed_produce
+        start = time.perf_counter()
+        try:
+            asyncio.run(engine.stream_activations(websocket, encoder))
+        finally:
+            del engine.produce_frame
+        return websocket, time.perf_counter() - start
+
+    websocket, elapsed = run(args.frames)
+    result = summarize(websocket.latencies)
+    result.update({
+        "format": args.format,
+        "target_fps": args.fps,
+        "achieved_fps": round(websocket.sent / elapsed, 2),
+        "bytes_per_frame": websocket.bytes_sent // max(websocket.sent, 1),
+    })
+
+    tracemalloc.start()
+    try:
+        websocket, _ = run(min(args.frames, 100))
+    finally:
+        tracemalloc.stop()
+    result["alloc_kb_per_iter"] = round(websocket.allocated / websocket.sent / 1024, 3)
+
+    engine.stop()
+    return result
+
+
+def compare(current, baseline, tolerance):
+    regressions = []
+    for name, metrics in current["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if metric not in metrics or metric not in previous:
+                continue
+            old, new = previous[metric], metrics[metric]
+            if old > 0 and new > old * (1 + tolerance):
+                regressions.append((name, metric, old, new))
+
+    old_rss = baseline.get("peak_rss_mb")
+    if old_rss and current["peak_rss_mb"] > old_rss * (1 + tolerance):
+        regressions.append(("process", "peak_rss_mb", old_rss, current["peak_rss_mb"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--checkpoint', default=os.getenv(
+        'RHIZOME_CHECKPOINT_PATH', './backend/checkpoints/rhizome_autoencoder_latest.pth'))
+    parser.add_argument('--data-dir', default=os.getenv('RHIZOME_DATA_DIR', './data/mnist'))
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--frames', type=int, default=300, help='frames for the end-to-end stream run')
+    parser.add_argument('--fps', type=int, default=1000, help='target FPS for the stream run (high = unpaced)')
+    parser.add_argument('--format', default='f16', help='frame format for the stream run')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--skip-stream', action='store_true', help='only run the micro benchmarks')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help='earlier results file to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='allowed slowdown before a metric counts as a regression')
+    args = parser.parse_args()
+
+    torch.set_num_threads(int(os.getenv('RHIZOME_BENCH_THREADS', torch.get_num_threads())))
+    model = load_model(args.checkpoint)
+
+    benchmarks = run_micro(model, args.iterations, args.batch_size)
+    if not args.skip_stream:
+        benchmarks["stream_activations"] = run_stream(args)
+
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "threads": torch.get_num_threads(),
+        "checkpoint": args.checkpoint if Path(args.checkpoint).exists() else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "benchmarks": benchmarks,
+    }
+
+    print(f"{'benchmark':<24} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'KiB/iter':>10}")
+    for name, metrics in benchmarks.items():
+        print(f"{name:<24} {metrics['p50_ms']:>9.3f} {metrics['p95_ms']:>9.3f} {metrics['p99_ms']:>9.3f} "
+              f"{metrics['alloc_kb_per_iter']:>10.1f}")
+    if "stream_activations" in benchmarks:
+        stream = benchmarks["stream_activations"]
+        print(f"stream: {stream['achieved_fps']} FPS, {stream['bytes_per_frame']} bytes/frame")
+    print(f"peak RSS: {results['peak_rss_mb']} MiB")
+
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"✓ Results written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"✗ {len(regressions)} regression(s) against {args.compare}:")
+            for name, metric, old, new in regressions:
+                print(f"  {name}.{metric}: {old} -> {new} ({(new / old - 1) * 100:+.1f}%)")
+            sys.exit(1)
+        print(f"✓ No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Build the memory-mapped activation store for a checkpoint.
+
+Run this offline after training so servers started with
+RHIZOME_FRAME_SOURCE=store stream without running inference.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import torch
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from network.model import RhizomeAutoencoder
+from network.training import load_checkpoint
+from streaming.store import build_activation_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--checkpoint', default=os.getenv(
+        'RHIZOME_CHECKPOINT_PATH', './backend/checkpoints/rhizome_autoencoder_latest.pth'))
+    parser.add_argument('--data-dir', default=os.getenv('RHIZOME_DATA_DIR', './data/mnist'))
+    parser.add_argument('--store-root', default=os.getenv(
+        'RHIZOME_STORE_DIR', './backend/cache/activations'),
+        help='each checkpoint gets its own <store-root>/<checkpoint name> directory')
+    parser.add_argument('--batch-size', type=int, default=1024)
+    args = parser.parse_args()
+
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    model = RhizomeAutoencoder()
+    load_checkpoint(model, args.checkpoint, device=device)
+
+    build_activation_store(
+        model,
+        args.checkpoint,
+        store_dir=Path(args.store_root) / Path(args.checkpoint).stem,
+        data_dir=args.data_dir,
+        batch_size=args.batch_size,
+        device=device
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Evaluate a checkpoint on the full MNIST test set.
+
+Sweeps all 10,000 test images in inference mode at a large batch size and
+reports reconstruction MSE overall and per digit, batch latency and
+throughput, then writes a JSON report. With --max-mse the exit status is
+non-zero when the checkpoint misses the bar, so deployments can gate on it.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+import torch
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from network.evaluation import evaluate_reconstruction
+from network.model import RhizomeAutoencoder
+from network.quantization import quantize_dynamic_int8
+from network.training import load_model_weights
+from data.loader import TensorMNIST
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--checkpoint', default=os.getenv(
+        'RHIZOME_CHECKPOINT_PATH', './backend/checkpoints/rhizome_autoencoder_latest.pth'))
+    parser.add_argument('--data-dir', default=os.getenv('RHIZOME_DATA_DIR', './data/mnist'))
+    parser.add_argument('--batch-size', type=int, default=4096)
+    parser.add_argument('--device', default='cuda' if torch.cuda.is_available() else 'cpu')
+    parser.add_argument('--quantize', action='store_true',
+                        help='evaluate the int8 model served with RHIZOME_QUANTIZE=int8')
+    parser.add_argument('--max-mse', type=float, default=None, help='fail (exit 1) above this test MSE')
+    parser.add_argument('--output', default='evaluation.json')
+    args = parser.parse_args()
+
+    device = 'cpu' if args.quantize else args.device
+    model = RhizomeAutoencoder()
+    checkpoint = load_model_weights(model, args.checkpoint, device=device)
+    model.eval()
+    if args.quantize:
+        model = quantize_dynamic_int8(model)
+
+    test_loader = TensorMNIST(args.data_dir, train=False, batch_size=args.batch_size, shuffle=False, device=device)
+    result = evaluate_reconstruction(model, test_loader, device)
+
+    print(f"✓ {result['samples']} test images in {result['batches']} batches of {args.batch_size} "
+          f"on {device}{' (int8)' if args.quantize else ''}")
+    print(f"mse={result['mse']:.6f} seconds={result['seconds']:.3f} "
+          f"samples/s={result['samples_per_sec']:.0f} "
+          f"batch_ms p50={result['latency_ms']['p50']:.2f} p95={result['latency_ms']['p95']:.2f}")
+    for label, stats in result['per_label'].items():
+        print(f"label={label} samples={stats['samples']:<5} mse={stats['mse']:.6f}")
+
+    report = {
+        "checkpoint": str(args.checkpoint),
+        "epoch": checkpoint.get('epoch'),
+        "device": device,
+        "quantized": args.quantize,
+        "batch_size": args.batch_size,
+        "torch": torch.__version__,
+        **result,
+    }
+    passed = args.max_mse is None or result['mse'] <= args.max_mse
+    if args.max_mse is not None:
+        report["max_mse"] = args.max_mse
+        report["passed"] = passed
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"✓ Report written to {args.output}")
+
+    if not passed:
+        print(f"FAIL: mse {result['mse']:.6f} above --max-mse {args.max_mse}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,4 +18,17 @@ function normalizeWsUrl(value) {
 const envWsUrl = normalizeWsUrl(import.meta.env.VITE_WS_URL);
 
 export const WS_URL = envWsUrl || DEFAULT_WS_URL;
+export const WS_FORMAT = import.meta.env.VITE_WS_FORMAT || 'f16';
+export const WS_ENCODING = import.meta.env.VITE_WS_ENCODING || '';
+export const WS_COMPRESSION = import.meta.env.VITE_WS_COMPRESSION || '';
+export const WS_TOPOLOGY = import.meta.env.VITE_WS_TOPOLOGY || 'progressive';
+// `?replay=<name>` on the page URL plays back a recorded session.
+export const WS_REPLAY = new URLSearchParams(window.location.search).get('replay')
+  || import.meta.env.VITE_WS_REPLAY || '';
+// `?lod=<buckets>` pools every layer into at most that many nodes for slow
+// devices; `?pool=max` picks max instead of mean pooling.
+export const WS_LOD = new URLSearchParams(window.location.search).get('lod')
+  || import.meta.env.VITE_WS_LOD || '';
+export const WS_POOL = new URLSearchParams(window.location.search).get('pool')
+  || import.meta.env.VITE_WS_POOL || '';
 export const IS_PROD = import.meta.env.PROD;
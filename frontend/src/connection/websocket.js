@@ -1,9 +1,117 @@
+const FRAME_MAGIC = 0x46415a52; // 'RZAF' read as little-endian uint32
+const FRAME_HEADER_BYTES = 24;
+const FRAME_DTYPE_F16 = 0;
+const FRAME_DTYPE_U8 = 1;
+const FRAME_KIND_DELTA = 1;
+const CODEC_MAGIC = 0x58435a52; // 'RZCX' read as little-endian uint32
+const CODEC_HEADER_BYTES = 12;
+const CODEC_NAMES = ['none', 'deflate', 'zstd'];
+
+let halfTable = null;
+
+function getHalfTable() {
+  if (halfTable) return halfTable;
+  halfTable = new Float32Array(65536);
+  for (let h = 0; h < 65536; h++) {
+    const sign = h & 0x8000 ? -1 : 1;
+    const exponent = (h >> 10) & 0x1f;
+    const fraction = h & 0x3ff;
+    if (exponent === 0) {
+      halfTable[h] = sign * Math.pow(2, -14) * (fraction / 1024);
+    } else if (exponent === 0x1f) {
+      halfTable[h] = fraction ? NaN : sign * Infinity;
+    } else {
+      halfTable[h] = sign * Math.pow(2, exponent - 15) * (1 + fraction / 1024);
+    }
+  }
+  return halfTable;
+}
+
+function decodeValues(buffer, offset, count, dtype) {
+  const values = new Float32Array(count);
+  if (dtype === FRAME_DTYPE_U8) {
+    const raw = new Uint8Array(buffer, offset, count);
+    for (let i = 0; i < count; i++) {
+      values[i] = raw[i] / 255;
+    }
+  } else if (dtype === FRAME_DTYPE_F16) {
+    const raw = new Uint16Array(buffer, offset, count);
+    const table = getHalfTable();
+    for (let i = 0; i < count; i++) {
+      values[i] = table[raw[i]];
+    }
+  }
+  return values;
+}
+
+export function decodeActivationFrame(buffer) {
+  const view = new DataView(buffer);
+  const dtype = view.getUint8(5);
+  const layerCount = view.getUint16(6, true);
+  const frame = view.getUint32(8, true);
+  const label = view.getInt16(12, true);
+  const kind = view.getUint8(14);
+  const timestamp = view.getFloat64(16, true);
+
+  if (kind === FRAME_KIND_DELTA) {
+    const count = view.getUint32(FRAME_HEADER_BYTES, true);
+    const indexOffset = FRAME_HEADER_BYTES + 4;
+    const indices = new Uint16Array(buffer, indexOffset, count);
+    const changes = decodeValues(buffer, indexOffset + count * 2, count, dtype);
+    return { type: 'activation', delta: true, frame, label, timestamp, indices, changes };
+  }
+
+  let offset = FRAME_HEADER_BYTES;
+  const layerSizes = [];
+  let totalNodes = 0;
+  for (let i = 0; i < layerCount; i++) {
+    const size = view.getUint32(offset, true);
+    layerSizes.push(size);
+    totalNodes += size;
+    offset += 4;
+  }
+
+  const values = decodeValues(buffer, offset, totalNodes, dtype);
+
+  return { type: 'activation', delta: false, frame, label, timestamp, layerSizes, values };
+}
+
+function isBinaryFrame(data) {
+  return data.byteLength >= FRAME_HEADER_BYTES
+    && new DataView(data).getUint32(0, true) === FRAME_MAGIC;
+}
+
+function decodeCodecAnnouncement(data) {
+  if (data.byteLength < CODEC_HEADER_BYTES) return null;
+  const view = new DataView(data);
+  if (view.getUint32(0, true) !== CODEC_MAGIC) return null;
+  const name = CODEC_NAMES[view.getUint8(5)] || 'none';
+  const dictionaryLength = view.getUint32(8, true);
+  return { name, dictionaryLength };
+}
+
+async function inflateRaw(data) {
+  const stream = new Blob([data]).stream().pipeThrough(new DecompressionStream('deflate-raw'));
+  return new Response(stream).arrayBuffer();
+}
+
 export class NetworkWebSocket {
-  constructor(url = 'ws://localhost:8001/ws') {
+  constructor(url = 'ws://localhost:8001/ws', format = 'f16', encoding = '', compression = '', topology = '', replay = '', lod = '', pool = '') {
     this.url = url;
+    this.topologyMode = topology;
+    this.replay = replay;
+    this.lod = lod;
+    this.pool = pool;
+    this.format = format;
+    this.encoding = encoding;
+    this.compression = compression;
+    this.codec = null;
+    this.pending = Promise.resolve();
+    this.activationValues = null;
     this.ws = null;
     this.topology = null;
     this.onTopologyReceived = null;
+    this.onTopologyChunk = null;
     this.onActivationFrame = null;
     this.onConnected = null;
     this.onDisconnected = null;
@@ -17,9 +125,13 @@ export class NetworkWebSocket {
     console.log(`Connecting to ${this.url}...`);
 
     try {
-      this.ws = new WebSocket(this.url);
+      this.ws = new WebSocket(this.getStreamUrl());
       this.ws.binaryType = 'arraybuffer';
 
+      this.activationValues = null;
+      this.codec = null;
+      this.pending = Promise.resolve();
+
       this.ws.onopen = () => {
         console.log('✓ WebSocket connected');
         this.reconnectAttempts = 0;
@@ -28,8 +140,13 @@ export class NetworkWebSocket {
         }
       };
 
+      const socket = this.ws;
       this.ws.onmessage = (event) => {
-        this.handleMessage(event.data);
+        // Decompression is async; chain messages so frames stay in order.
+        // Messages still queued after the socket was closed are dropped.
+        this.pending = this.pending
+          .then(() => socket.readyState === WebSocket.OPEN && this.handleMessage(event.data))
+          .catch((error) => console.error('Failed to handle message:', error));
       };
 
       this.ws.onerror = (error) => {
@@ -66,7 +183,80 @@ export class NetworkWebSocket {
     }
   }
 
-  handleMessage(data) {
+  getStreamUrl() {
+    const params = new URLSearchParams();
+    if (this.format && this.format !== 'json') {
+      params.set('format', this.format);
+      if (this.encoding) {
+        params.set('encoding', this.encoding);
+      }
+    }
+    if (this.compression) {
+      // Browsers can inflate raw deflate natively, but not with a preset dictionary.
+      params.set('compression', this.compression);
+      params.set('dict', '0');
+    }
+    if (this.topologyMode) {
+      params.set('topology', this.topologyMode);
+    }
+    if (this.replay) {
+      params.set('replay', this.replay);
+    }
+    if (this.lod) {
+      params.set('lod', this.lod);
+      if (this.pool) {
+        params.set('pool', this.pool);
+      }
+    }
+    if (!params.toString()) return this.url;
+    const separator = this.url.includes('?') ? '&' : '?';
+    return `${this.url}${separator}${params.toString()}`;
+  }
+
+  handleBinaryFrame(data) {
+    const frame = decodeActivationFrame(data);
+
+    if (frame.delta) {
+      // Deltas patch the last keyframe; one arriving first is dropped.
+      if (!this.activationValues) return;
+      for (let i = 0; i < frame.indices.length; i++) {
+        this.activationValues[frame.indices[i]] = frame.changes[i];
+      }
+    } else {
+      this.activationValues = frame.values;
+    }
+
+    if (this.onActivationFrame) {
+      this.onActivationFrame({ ...frame, values: this.activationValues });
+    }
+  }
+
+  async handleMessage(data) {
+    if (this.compression && !this.codec) {
+      const codec = decodeCodecAnnouncement(data);
+      if (codec) {
+        if (codec.name !== 'none' && (codec.name !== 'deflate' || codec.dictionaryLength > 0)) {
+          // Nothing after this could be decoded; reconnect uncompressed instead.
+          console.error(`Unsupported stream codec: ${codec.name}, reconnecting without compression`);
+          this.compression = '';
+          this.ws.close();
+          return;
+        }
+        console.log(`✓ Stream codec: ${codec.name}`);
+        this.codec = codec;
+        return;
+      }
+    }
+
+    if (this.codec && this.codec.name === 'deflate') {
+      data = await inflateRaw(data);
+    }
+
+    if (isBinaryFrame(data)) {
+      this.handleBinaryFrame(data);
+      return;
+    }
+
     const text = new TextDecoder().decode(data);
     const message = JSON.parse(text);
 
@@ -76,6 +266,10 @@ export class NetworkWebSocket {
       if (this.onTopologyReceived) {
         this.onTopologyReceived(message);
       }
+    } else if (message.type === 'topology_chunk') {
+      if (this.onTopologyChunk) {
+        this.onTopologyChunk(message);
+      }
     } else if (message.type === 'activation') {
       if (this.onActivationFrame) {
         this.onActivationFrame(message);
@@ -85,6 +279,21 @@ export class NetworkWebSocket {
     }
   }
 
+  // Replay controls; ignored by the server on live streams.
+  seek(frame) {
+    this.sendControl({ type: 'seek', frame });
+  }
+
+  setSpeed(value) {
+    this.sendControl({ type: 'speed', value });
+  }
+
+  sendControl(message) {
+    if (this.isConnected()) {
+      this.ws.send(JSON.stringify(message));
+    }
+  }
+
   disconnect() {
     if (this.ws) {
       console.log('Disconnecting...');
@@ -2,7 +2,7 @@ import { NetworkWebSocket } from './connection/websocket.js';
 import { NetworkGraph } from './visualization/network.js';
 import { NetworkScene } from './visualization/scene.js';
 import { ParticlePool, PathCache } from './visualization/particles.js';
-import { WS_URL } from './config.js';
+import { WS_URL, WS_FORMAT, WS_ENCODING, WS_COMPRESSION, WS_TOPOLOGY, WS_REPLAY, WS_LOD, WS_POOL } from './config.js';
 
 class RhizomeVisualization {
   constructor() {
@@ -36,7 +36,7 @@ class RhizomeVisualization {
     console.log('='.repeat(70));
 
     this.graph = new NetworkGraph();
-    this.ws = new NetworkWebSocket(WS_URL);
+    this.ws = new NetworkWebSocket(WS_URL, WS_FORMAT, WS_ENCODING, WS_COMPRESSION, WS_TOPOLOGY, WS_REPLAY, WS_LOD, WS_POOL);
     this.ws.onConnected = () => {
       this.updateStatus('connected', 'Connected');
       this.hideLoading();
@@ -60,6 +60,10 @@ class RhizomeVisualization {
       this.handleTopology(topology);
     };
 
+    this.ws.onTopologyChunk = (chunk) => {
+      this.handleTopologyChunk(chunk);
+    };
+
     this.ws.onActivationFrame = (frame) => {
       this.handleActivationFrame(frame);
     };
@@ -110,6 +114,17 @@ class RhizomeVisualization {
     this.animate();
   }
 
+  handleTopologyChunk(chunk) {
+    if (!this.scene) return;
+
+    const added = this.graph.loadTopologyChunk(chunk);
+    this.scene.addLinks(added);
+
+    if (chunk.index === chunk.count - 1) {
+      console.log(`✓ Topology complete (${this.graph.getLinks().length} links)`);
+    }
+  }
+
   handleActivationFrame(frame) {
     this.graph.updateActivations(frame);
 
@@ -19,6 +19,23 @@ const LAYER_ORDER = [
   'decoder.6'
 ];
 
+// Topology connections arrive as columnar source/target/weight arrays of node
+// indices; older servers sent a list of {source, target, weight} objects.
+function normalizeConnections(connections) {
+  if (Array.isArray(connections)) {
+    return { length: connections.length, get: (i) => connections[i] };
+  }
+  const { source, target, weight } = connections;
+  return {
+    length: weight.length,
+    get: (i) => ({
+      source: `node_${source[i]}`,
+      target: `node_${target[i]}`,
+      weight: weight[i]
+    })
+  };
+}
+
 export class NetworkGraph {
   constructor() {
     this.nodes = [];
@@ -60,12 +77,28 @@ export class NetworkGraph {
       this.nodeMap.set(node.id, node);
     });
 
+    this.links = [];
+    // Progressive topologies arrive strongest-first, so later chunks are
+    // simply cut off at the cap; a full topology is sampled evenly instead.
+    this.progressive = Boolean(topology.metadata.progressive);
+    this.addConnections(topology.connections);
+
+    console.log(`✓ Loaded ${this.nodes.length} nodes, ${this.links.length} links`);
+
+    this.initializeForces();
+  }
+
+  addConnections(rawConnections) {
+    const connections = normalizeConnections(rawConnections);
     const maxLinks = 50000;
-    const linkStep = Math.ceil(topology.connections.length / maxLinks);
+    const room = maxLinks - this.links.length;
+    if (room <= 0) return [];
 
-    this.links = [];
-    for (let i = 0; i < topology.connections.length; i += linkStep) {
-      const conn = topology.connections[i];
+    const linkStep = this.progressive ? 1 : Math.max(1, Math.ceil(connections.length / room));
+    const added = [];
+
+    for (let i = 0; i < connections.length && added.length < room; i += linkStep) {
+      const conn = connections.get(i);
       const source = this.nodeMap.get(conn.source);
       const target = this.nodeMap.get(conn.target);
 
@@ -77,14 +110,22 @@ export class NetworkGraph {
           pulseIntensity: 0 // For connection pulse effect
         };
         this.links.push(link);
+        added.push(link);
         const key = `${conn.source}-${conn.target}`;
         this.linkMap.set(key, link);
       }
     }
 
-    console.log(`✓ Loaded ${this.nodes.length} nodes, ${this.links.length} links`);
+    return added;
+  }
 
-    this.initializeForces();
+  loadTopologyChunk(chunk) {
+    const added = this.addConnections(chunk.connections);
+    if (added.length && this.simulation) {
+      this.simulation.force('link').links(this.links);
+      this.reheat(0.1);
+    }
+    return added;
   }
 
   initializeForces() {
@@ -136,6 +177,15 @@ export class NetworkGraph {
   }
 
   updateActivations(activationFrame) {
+    if (activationFrame.values) {
+      const values = activationFrame.values;
+      const count = Math.min(values.length, this.nodes.length);
+      for (let i = 0; i < count; i++) {
+        this.nodes[i].activation = values[i];
+      }
+      return;
+    }
+
     const activations = activationFrame.activations;
 
     for (const [nodeId, value] of Object.entries(activations)) {
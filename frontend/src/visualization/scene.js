@@ -374,6 +374,13 @@ export class NetworkScene {
     console.log(`✓ Created ${this.links.length} links`);
   }
 
+  addLinks(links) {
+    for (const link of links) {
+      this.addNeighbor(link.source.id, link.target.id);
+      this.addNeighbor(link.target.id, link.source.id);
+    }
+  }
+
   addNeighbor(sourceId, targetId) {
     if (!this.neighborMap.has(sourceId)) {
       this.neighborMap.set(sourceId, new Set());
@@ -0,0 +1,45 @@
+"""
+Record an activation session to disk for replay over /ws?replay=<name>.
+
+Produces frames from the streaming engine offline at the given frame rate
+(no clients or pacing needed) and appends them to a recording. To record
+what a live server actually broadcasts instead, start it with
+RHIZOME_RECORD=1.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from streaming.recording import get_recording_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--checkpoint', default=os.getenv(
+        'RHIZOME_CHECKPOINT_PATH', './backend/checkpoints/rhizome_autoencoder_latest.pth'))
+    parser.add_argument('--data-dir', default=os.getenv('RHIZOME_DATA_DIR', './data/mnist'))
+    parser.add_argument('--frames', type=int, default=1800)
+    parser.add_argument('--fps', type=float, default=30.0, help='frame rate the timestamps are spaced at')
+    parser.add_argument('--name', help='recording name (default: checkpoint name and time)')
+    parser.add_argument('--recording-dir', default=str(get_recording_dir()))
+    args = parser.parse_args()
+
+    from streaming.engine import StreamingEngine
+
+    engine = StreamingEngine(checkpoint_path=args.checkpoint, device='cuda', data_dir=args.data_dir)
+    engine.warmup()
+
+    name = args.name or f"{engine.checkpoint_name}-{time.strftime('%Y%m%d-%H%M%S')}"
+    recorder = engine.start_recording(Path(args.recording_dir) / name)
+    for i in range(args.frames):
+        recorder.append(engine.produce_frame(i, i / args.fps))
+    engine.stop()
+
+
+if __name__ == "__main__":
+    main()
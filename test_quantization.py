@@ -0,0 +1,71 @@
+"""Int8 dynamic quantization check: accuracy and latency against fp32."""
+
+import os
+import time
+import torch
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'backend'))
+
+from network.model import RhizomeAutoencoder
+from network.hooks import ActivationCapture
+from network.quantization import quantize_dynamic_int8
+from network.training import load_checkpoint
+from data.loader import get_mnist_loaders
+
+
+def forward_ms(model, inputs, iterations=50):
+    with torch.inference_mode():
+        for _ in range(5):
+            model(inputs)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            model(inputs)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def test_quantization():
+    model = RhizomeAutoencoder()
+
+    checkpoint_path = Path(os.getenv(
+        'RHIZOME_CHECKPOINT_PATH', './backend/checkpoints/rhizome_autoencoder_latest.pth'))
+    load_checkpoint(model, checkpoint_path, device='cpu')
+
+    model.eval()
+    quantized = quantize_dynamic_int8(model)
+
+    _, test_loader = get_mnist_loaders(batch_size=1000, data_dir=os.getenv('RHIZOME_DATA_DIR', './data/mnist'))
+    images, _ = next(iter(test_loader))
+    images = images.view(images.size(0), -1)
+
+    # Normalized exactly as the stream sends them.
+    outputs = {}
+    activations = {}
+    for name, net in (("fp32", model), ("int8", quantized)):
+        capture = ActivationCapture(net)
+        with torch.inference_mode():
+            outputs[name] = net(images)
+        activations[name] = capture.get_activations(normalize=True)
+        capture.remove_hooks()
+
+    mse_fp32 = torch.mean((images - outputs["fp32"]) ** 2).item()
+    mse_int8 = torch.mean((images - outputs["int8"]) ** 2).item()
+    print(f"mse fp32={mse_fp32:.6f} int8={mse_int8:.6f} "
+          f"change={(mse_int8 - mse_fp32) / mse_fp32 * 100:+.2f}%")
+
+    for layer, reference in activations["fp32"].items():
+        error = (activations["int8"][layer] - reference).abs()
+        print(f"layer={layer:<10} nodes={reference.shape[1]:<4} "
+              f"mean_abs_err={error.mean().item():.5f} max_abs_err={error.max().item():.5f}")
+
+    for batch_size in (1, 256):
+        inputs = images[:batch_size]
+        fp32_ms = forward_ms(model, inputs)
+        int8_ms = forward_ms(quantized, inputs)
+        print(f"batch={batch_size:<4} fp32={fp32_ms:.3f}ms int8={int8_ms:.3f}ms "
+              f"speedup={fp32_ms / int8_ms:.2f}x per_sample_int8={int8_ms / batch_size * 1000:.1f}us")
+
+
+if __name__ == "__main__":
+    test_quantization()
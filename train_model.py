@@ -2,8 +2,13 @@
 Train Rhizome Autoencoder - Full Training Run
 
 Trains the model for 10 epochs on MNIST and saves checkpoints.
+Pass --fast (optionally with --amp, --compile, --batch-scale) for the
+high-throughput mode, and --workers N to train data-parallel across N
+CPU processes.
 """
 
+import argparse
+import os
 import torch
 import sys
 from pathlib import Path
@@ -12,18 +17,45 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / 'backend'))
 
 from network.model import RhizomeAutoencoder
-from network.training import train_autoencoder
+from network.training import train_autoencoder, train_distributed, scale_hyperparameters
 from data.loader import get_mnist_loaders
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the Rhizome autoencoder on MNIST")
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--fast', action='store_true',
+                        help='keep the running loss on device and enable autocast (--amp auto)')
+    parser.add_argument('--amp', choices=['none', 'auto', 'bf16', 'fp16'], default=None,
+                        help='autocast dtype (bf16 on CPU, fp16 where CUDA is available)')
+    parser.add_argument('--compile', action='store_true', help='wrap the model with torch.compile')
+    parser.add_argument('--batch-scale', type=float, default=1,
+                        help='multiply the batch size (64) and scale the learning rate to match')
+    parser.add_argument('--lr-rule', choices=['linear', 'sqrt'], default='linear')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='data-parallel CPU processes (gloo); the batch is per process '
+                             'and the learning rate is scaled by --lr-rule to match')
+    parser.add_argument('--data-dir', default=os.getenv('RHIZOME_DATA_DIR', './data/mnist'))
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    amp = args.amp if args.amp is not None else ('auto' if args.fast else None)
+    batch_size, learning_rate = scale_hyperparameters(64, 0.001, args.batch_scale, args.lr_rule)
+    if args.workers > 1:
+        _, learning_rate = scale_hyperparameters(batch_size, learning_rate, args.workers, args.lr_rule)
+
     print("\n" + "=" * 70)
     print("RHIZOME AUTOENCODER - FULL TRAINING")
     print("=" * 70)
 
     # Check CUDA
     device = 'cuda' if torch.cuda.is_available() else 'cpu'
-    if device == 'cuda':
+    if args.workers > 1:
+        device = 'cpu'
+        print(f"✓ Distributed: {args.workers} CPU processes (gloo)")
+    elif device == 'cuda':
         print(f"✓ GPU: {torch.cuda.get_device_name(0)}")
         print(f"✓ VRAM: {torch.cuda.get_device_properties(0).total_memory / 1024**3:.2f} GB")
     else:
@@ -32,27 +64,42 @@ def main():
     # Create model
     print("\nInitializing model...")
     model = RhizomeAutoencoder()
-    model.summary()
+    print(f"✓ Parameters: {model.count_parameters():,}")
+
+    train_kwargs = dict(
+        epochs=args.epochs,
+        learning_rate=learning_rate,
+        checkpoint_dir='./backend/checkpoints',
+        save_every=2,
+        fast=args.fast,
+        amp=amp,
+        compile_model=args.compile
+    )
 
     # Load data
     print("\nLoading MNIST dataset...")
-    train_loader, test_loader = get_mnist_loaders(batch_size=64)
+    if args.workers > 1:
+        print(f"Batch size: {batch_size} x {args.workers} processes | learning rate: {learning_rate:g}")
+    else:
+        print(f"Batch size: {batch_size} | learning rate: {learning_rate:g}")
+        train_loader, test_loader = get_mnist_loaders(batch_size=batch_size, data_dir=args.data_dir, device=device)
 
     # Train
     print("\n" + "=" * 70)
     print("Starting training...")
     print("=" * 70)
 
-    history = train_autoencoder(
-        model=model,
-        train_loader=train_loader,
-        test_loader=test_loader,
-        epochs=10,
-        learning_rate=0.001,
-        device=device,
-        checkpoint_dir='./backend/checkpoints',
-        save_every=2
-    )
+    if args.workers > 1:
+        # Each process builds its own model and data shard.
+        history = train_distributed(args.workers, batch_size=batch_size, data_dir=args.data_dir, **train_kwargs)
+    else:
+        history = train_autoencoder(
+            model=model,
+            train_loader=train_loader,
+            test_loader=test_loader,
+            device=device,
+            **train_kwargs
+        )
 
     print("\n" + "=" * 70)
     print("TRAINING COMPLETE!")